@@ -0,0 +1,29 @@
+// frontend/app/api/ai/execute/route.ts
+import { NextRequest, NextResponse } from "next/server";
+
+const SERVER_URL = process.env.NEXT_PUBLIC_SERVER_URL as string;
+
+export async function POST(req: NextRequest) {
+  const auth = req.headers.get("authorization") ?? "";
+  const prefer = req.headers.get("prefer") ?? "";
+  const body = await req.text();
+
+  const upstream = await fetch(`${SERVER_URL}/ai/execute${req.nextUrl.search}`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      ...(auth ? { Authorization: auth } : {}),
+      ...(prefer ? { Prefer: prefer } : {}),
+    },
+    body,
+  });
+
+  const text = await upstream.text();
+  return new NextResponse(text, {
+    status: upstream.status,
+    headers: {
+      "Content-Type":
+        upstream.headers.get("content-type") ?? "application/json",
+    },
+  });
+}
@@ -0,0 +1,28 @@
+// frontend/app/api/ai/interpret/stream/route.ts
+import { NextRequest } from "next/server";
+
+const SERVER_URL = process.env.NEXT_PUBLIC_SERVER_URL as string;
+
+// Pass the SSE body through unbuffered so partial command fields reach the UI as they arrive
+export async function POST(req: NextRequest) {
+  const auth = req.headers.get("authorization") ?? "";
+  const body = await req.text();
+
+  const upstream = await fetch(`${SERVER_URL}/ai/interpret/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      ...(auth ? { Authorization: auth } : {}),
+    },
+    body,
+  });
+
+  return new Response(upstream.body, {
+    status: upstream.status,
+    headers: {
+      "Content-Type":
+        upstream.headers.get("content-type") ?? "text/event-stream",
+      "Cache-Control": "no-cache",
+    },
+  });
+}
@@ -9,7 +9,7 @@ export async function GET(req: NextRequest) {
       req.headers.get("Authorization") ??
       "";
 
-    const upstream = await fetch(`${SERVER_URL}/calendar/list`, {
+    const upstream = await fetch(`${SERVER_URL}/calendar/list${req.nextUrl.search}`, {
       method: "GET",
       headers: {
         "Content-Type": "application/json",
@@ -10,11 +10,14 @@ export async function POST(req: NextRequest) {
       "";
     const body = await req.json();
 
-    const upstream = await fetch(`${SERVER_URL}/calendar/mutate`, {
+    const prefer = req.headers.get("prefer") ?? "";
+
+    const upstream = await fetch(`${SERVER_URL}/calendar/mutate${req.nextUrl.search}`, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
         "Authorization": auth,
+        ...(prefer ? { "Prefer": prefer } : {}),
       },
       body: JSON.stringify(body),
     });
@@ -1,7 +1,8 @@
 import os, json
+from functools import lru_cache
 from typing import Any, Dict
-from openai import AsyncOpenAI
 from pydantic import ValidationError
+from server.ai.client import chat_json
 from ai.schema import Command
 
 SYS = """You are a calendar command planner.
@@ -21,25 +22,21 @@ Output keys: action, target, params, confidence, needs_clarification, clarificat
 """
 
 class OpenAILLM:
+    # Stateless apart from the model name; the HTTP client is the shared,
+    # pooled one from ai.client. Use get_llm() rather than constructing these.
     def __init__(self, model: str | None = None):
         self.model = model or os.getenv("LLM_MODEL", "gpt-4o-mini")
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is not set; check server/.env and process env")
-        self.client = AsyncOpenAI(api_key=api_key)
 
     async def interpret(self, user_text: str, tz: str) -> Command:
         msg_user = USER_TMPL.format(tz=tz, text=user_text)
-        resp = await self.client.chat.completions.create(
-            model=self.model,
-            temperature=0.1,
-            response_format={"type": "json_object"},
-            messages=[
+        raw = await chat_json(
+            self.model,
+            [
                 {"role": "system", "content": SYS},
                 {"role": "user", "content": msg_user},
             ],
+            temperature=0.1,
         )
-        raw = resp.choices[0].message.content
 
         # First attempt: strict parse
         try:
@@ -72,5 +69,9 @@ class OpenAILLM:
 
             # Try again
             return Command.model_validate(data)
+
+@lru_cache(maxsize=8)
+def get_llm(model: str | None = None) -> OpenAILLM:
+    return OpenAILLM(model=model)
 # Forward specific adapter to canonical module
 from server.ai.adapters.openai_adapter import *  # type: ignore
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Bounded LRU + TTL cache of validated interpreter commands.
+#
+# Key: (normalized utterance, tz). Each entry remembers the coarse "now" bucket
+# it was interpreted in. Commands that carry times ("lunch tomorrow at noon")
+# only hit within the same bucket, so relative dates never go stale; commands
+# without times ("delete last") hit for the whole TTL.
+
+_MAX = int(os.getenv("AI_CACHE_SIZE") or 1024)
+_TTL_S = float(os.getenv("AI_CACHE_TTL_S") or 600)
+_BUCKET_S = float(os.getenv("AI_CACHE_BUCKET_S") or 60)
+
+_WS = re.compile(r"\s+")
+
+def normalize(text: str) -> str:
+    return _WS.sub(" ", text.strip().lower()).rstrip(".!?")
+
+def _time_dependent(cmd: Dict[str, Any]) -> bool:
+    return bool(cmd.get("start") or cmd.get("end"))
+
+class InterpretCache:
+    def __init__(self, maxsize: int = _MAX, ttl_s: float = _TTL_S, bucket_s: float = _BUCKET_S):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.bucket_s = bucket_s
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _bucket(self, now: float) -> int:
+        return int(now // self.bucket_s)
+
+    def get(self, text: str, tz: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        key = (normalize(text), tz)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, bucket, cmd = entry
+                fresh = now - stored_at < self.ttl_s
+                if fresh and (bucket == self._bucket(now) or not _time_dependent(cmd)):
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(cmd)
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, text: str, tz: str, cmd: Dict[str, Any], now: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        now = time.time() if now is None else now
+        key = (normalize(text), tz)
+        with self._lock:
+            self._data[key] = (now, self._bucket(now), copy.deepcopy(cmd))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+
+# One long-lived AsyncOpenAI client shared by every interpret path. Its httpx
+# pool keeps connections to the API warm (no TLS handshake per utterance), and
+# a semaphore caps in-flight LLM calls so bursts queue here instead of piling
+# onto the provider's rate limits. OPENAI_BASE_URL (read by the SDK) can point
+# it at a local stub.
+
+_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S") or 30)
+_CONNECT_TIMEOUT_S = float(os.getenv("LLM_CONNECT_TIMEOUT_S") or 5)
+_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS") or 100)
+_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE") or 20)
+_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY") or 64)
+_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES") or 1)
+
+# (loop, client, gate). httpx pools are bound to the loop that opened them, so
+# a new loop (tests, scripts calling asyncio.run twice) gets a fresh client.
+_shared: Optional[Tuple[asyncio.AbstractEventLoop, AsyncOpenAI, asyncio.Semaphore]] = None
+
+def get_client() -> Tuple[AsyncOpenAI, asyncio.Semaphore]:
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared[0] is not loop:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is not set; check server/.env and process env")
+        timeout = httpx.Timeout(_TIMEOUT_S, connect=_CONNECT_TIMEOUT_S)
+        http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=_MAX_CONNECTIONS, max_keepalive_connections=_MAX_KEEPALIVE),
+        )
+        client = AsyncOpenAI(api_key=api_key, http_client=http, timeout=timeout, max_retries=_MAX_RETRIES)
+        _shared = (loop, client, asyncio.Semaphore(_MAX_CONCURRENCY))
+    return _shared[1], _shared[2]
+
+async def chat_json(model: str, messages: List[Dict[str, str]], temperature: float = 0.0) -> str:
+    """Run one JSON-mode chat completion on the shared client; returns the raw content."""
+    client, gate = get_client()
+    async with gate:
+        resp = await client.chat.completions.create(
+            model=model,
+            temperature=temperature,
+            response_format={"type": "json_object"},
+            messages=messages,
+        )
+    return resp.choices[0].message.content or "{}"
+
+async def chat_json_stream(model: str, messages: List[Dict[str, str]], temperature: float = 0.0) -> AsyncIterator[str]:
+    """chat_json, streamed: yields content deltas as they arrive."""
+    client, gate = get_client()
+    async with gate:
+        stream = await client.chat.completions.create(
+            model=model,
+            temperature=temperature,
+            response_format={"type": "json_object"},
+            messages=messages,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+async def aclose() -> None:
+    global _shared
+    if _shared is not None:
+        _, client, _ = _shared
+        _shared = None
+        await client.close()
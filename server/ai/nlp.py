@@ -1,6 +1,8 @@
 import re
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Literal, Optional
+from zoneinfo import ZoneInfo
 
 Intent = Literal['add','list','delete','unknown']
 WEEKDAYS = ['monday','tuesday','wednesday','thursday','friday','saturday','sunday']
@@ -48,3 +50,196 @@ def parse(text: str) -> dict:
         start_iso = start_dt.isoformat()
 
     return {'intent': intent, 'title': title, 'start_at': start_iso, 'end_at': None, 'all_day': False}
+
+
+# --- Fast path -------------------------------------------------------------
+# Deterministic, confidence-scored parser for the simple utterances that make
+# up most voice traffic. It emits the /calendar/mutate payload that
+# pipeline.py's LLM prompt produces; anything it cannot pin down exactly
+# (missing date or time, am/pm ambiguity, recurrence, edits, leftover temporal
+# words, a spoken timezone) scores low and is escalated to the LLM.
+
+DEFAULT_MINUTES = 30
+_MONTHS = ['jan','feb','mar','apr','may','jun','jul','aug','sep','oct','nov','dec']
+
+_DELETE_LAST = re.compile(r"^(?:please )?(?:delete|remove|undo|cancel|scratch) (?:the |my )?(?:last|previous|latest)(?: one| event| entry| thing)?$")
+_ESCALATE = re.compile(r"\b(?:every|each|daily|weekly|monthly|yearly|invite|move|reschedule|rename|change|update|remind|reminder|except|unless|delete|remove|cancel|list|show|what|when|midnight)\b")
+# A spoken timezone ("9am est", "3pm pacific time", "10:00 utc+2"): the LLM has to convert it
+_TZ_NAME = re.compile(r"\b(?:utc|gmt|[ecmp][sd]t|ak[sd]t|hst|a[sd]t|cet|cest|eet|eest|bst|ist|jst|kst|aest|aedt|acst|awst|nzst|nzdt)(?:[+-]\d{1,2})?\b"
+                      r"|\b(?:eastern|pacific|central|mountain|atlantic)(?: standard| daylight)? time\b"
+                      r"|(?:\d|[ap]\.?m\.?) ?(?:et|pt|ct|mt)\b")
+_VERB = re.compile(r"^(?:please )?(?:add|create|schedule|book|set up|put|make)(?: (?:a|an|my|the))?\s+")
+_REL_DAY = re.compile(r"\b(today|tonight|tomorrow|tmrw)\b")
+_WEEKDAY = re.compile(r"\b(?:on |this )?(next )?(" + '|'.join(WEEKDAYS) + r")\b")
+_MONTH_DAY = re.compile(r"\b(?:on )?(" + '|'.join(_MONTHS) + r")[a-z]*\.? (\d{1,2})(?:st|nd|rd|th)?\b")
+_AMPM = r"(a\.?m\.?|p\.?m\.?)"
+_RANGE = re.compile(r"\b(?:from )?(\d{1,2})(?::(\d{2}))? ?" + _AMPM + r"? ?(?:-|–|to|until|till) ?(\d{1,2})(?::(\d{2}))? ?" + _AMPM + r"(?!\w)")
+_SHARP = r"(?: sharp\b)?"
+_NAMED_TIME = re.compile(r"\b(?:at )?(noon|midday)\b" + _SHARP)
+_CLOCK = re.compile(r"\b(?:at |@ ?)?(\d{1,2})(?::(\d{2}))? ?" + _AMPM + r"(?!\w)" + _SHARP)
+_CLOCK_24 = re.compile(r"\b(?:at |@ ?)(\d{1,2}):(\d{2})\b|\bat (\d{1,2})\b")
+_DURATION = re.compile(r"\bfor (an hour and a half|half an hour|an? hour|one hour|(\d+(?:\.\d+)?) ?(hours?|hrs?|h|minutes?|mins?|m))\b")
+# "... to my calendar", "put X on the calendar": where it goes, not what it is
+_TARGET = re.compile(r"\b(?:to|on|in|onto|into) (?:my |the |our )?(?:calendar|cal|schedule|agenda)\b")
+_FILLER = {'a', 'an', 'the', 'on', 'at', 'for', 'my', 'from', 'please', 'thanks'}
+# Words that mean the utterance still carries unparsed timing: a second date or
+# time, an alternative ("or tuesday"), or a qualifier on the one we parsed
+_TEMPORAL_LEFTOVER = re.compile(
+    r"\d|\b(?:am|pm|in|after|before|next|last|morning|afternoon|evening|night|week|weekend|month|year|hour|hours"
+    r"|minute|minutes|day|days|o'clock|oclock|today|tonight|tomorrow|tmrw|noon|midday|or|either|maybe|around|about"
+    r"|ish|by|until|till|through|between|later|earlier|" + '|'.join(WEEKDAYS) + r"|january|february|march|april|may"
+    r"|june|july|august|september|sept|october|november|december)\b"
+)
+
+@dataclass
+class FastParse:
+    command: Optional[dict]
+    confidence: float
+
+_MISS = FastParse(None, 0.0)
+
+def _hour24(hour: int, ampm: Optional[str]) -> Optional[int]:
+    if ampm is None:
+        return hour if 0 <= hour <= 23 else None
+    if not 1 <= hour <= 12:
+        return None
+    pm = ampm.startswith('p')
+    return (hour % 12) + (12 if pm else 0)
+
+def _duration_minutes(m: 're.Match') -> int:
+    phrase = m.group(1)
+    if phrase == 'an hour and a half':
+        return 90
+    if phrase == 'half an hour':
+        return 30
+    if m.group(2) is None:
+        return 60
+    n = float(m.group(2))
+    return int(round(n * 60)) if m.group(3).startswith('h') else int(round(n))
+
+def fast_parse(text: str, tz: str, now: Optional[datetime] = None) -> FastParse:
+    zone = ZoneInfo(tz)
+    now = now.astimezone(zone) if now else datetime.now(zone)
+    cased = re.sub(r"\s+", " ", text.strip()).rstrip('.!?')
+    t = cased.lower()
+    if len(t) != len(cased):
+        cased = t  # case folding changed offsets; fall back to a lowercase title
+    if not t:
+        return _MISS
+    if _DELETE_LAST.match(t):
+        return FastParse({'op': 'delete_last'}, 0.98)
+    if _ESCALATE.search(t) or _TZ_NAME.search(t):
+        return _MISS
+
+    verb = _VERB.match(t)
+    rest = t[verb.end():] if verb else t
+    rest_cased = cased[len(t) - len(rest):]
+    spans = []  # matched (start, end) character spans, removed to leave the title
+
+    def take(rx: 're.Pattern') -> Optional['re.Match']:
+        m = rx.search(rest)
+        if m:
+            spans.append(m.span())
+        return m
+
+    # Date
+    day: Optional[datetime] = None
+    evening = False
+    if (m := take(_REL_DAY)):
+        word = m.group(1)
+        day = now + timedelta(days=1) if word in ('tomorrow', 'tmrw') else now
+        evening = word == 'tonight'
+    elif (m := take(_WEEKDAY)):
+        if m.group(1):
+            return _MISS  # "next friday" is read two ways; let the LLM decide
+        ahead = (WEEKDAYS.index(m.group(2)) - now.weekday()) % 7
+        if ahead == 0:
+            return _MISS  # today or a week out?
+        day = now + timedelta(days=ahead)
+    elif (m := take(_MONTH_DAY)):
+        month = _MONTHS.index(m.group(1)) + 1
+        try:
+            day = now.replace(month=month, day=int(m.group(2)))
+        except ValueError:
+            return _MISS
+        if day.date() < now.date():
+            try:
+                day = day.replace(year=now.year + 1)
+            except ValueError:
+                return _MISS
+    if day is None:
+        return FastParse(None, 0.3)
+
+    # Time: explicit range, or a start (+ optional duration)
+    start_hm = end_hm = None
+    if (m := take(_RANGE)):
+        eh = _hour24(int(m.group(4)), m.group(6))
+        sh = _hour24(int(m.group(1)), m.group(3) or m.group(6))
+        if eh is None or sh is None:
+            return _MISS
+        start_hm, end_hm = (sh, int(m.group(2) or 0)), (eh, int(m.group(5) or 0))
+        if not m.group(3) and start_hm >= end_hm and sh >= 12:
+            start_hm = (sh - 12, start_hm[1])  # "11 to 1pm" starts at 11am
+    elif (m := take(_NAMED_TIME)):
+        start_hm = (12, 0)
+    elif (m := take(_CLOCK)):
+        h = _hour24(int(m.group(1)), m.group(3))
+        if h is None:
+            return _MISS
+        start_hm = (h, int(m.group(2) or 0))
+    elif (m := take(_CLOCK_24)):
+        if m.group(3) is not None:
+            h, mi = int(m.group(3)), 0
+            if evening and 1 <= h <= 11:
+                h += 12
+            elif not 13 <= h <= 23:
+                return FastParse(None, 0.5)  # "at 3": am or pm?
+        else:
+            h, mi = int(m.group(1)), int(m.group(2))
+            if evening and 1 <= h <= 11:
+                h += 12
+            elif not (m.group(1).startswith('0') or 13 <= h <= 23):
+                # Only "09:30" or "13:30" read as 24-hour time; "10:30" may be evening
+                return FastParse(None, 0.5)
+        if h > 23:
+            return _MISS
+        start_hm = (h, mi)
+    if start_hm is None or not (0 <= start_hm[1] < 60) or (end_hm and not 0 <= end_hm[1] < 60):
+        return FastParse(None, 0.5)
+
+    take(_TARGET)
+
+    minutes = DEFAULT_MINUTES
+    if (m := take(_DURATION)):
+        if end_hm is not None:
+            return _MISS
+        minutes = _duration_minutes(m)
+        if minutes <= 0:
+            return _MISS
+
+    # Title is whatever is left once the recognised spans are cut out
+    kept, pos = [], 0
+    for a, b in sorted(spans):
+        if a < pos:
+            return _MISS  # overlapping matches: the phrasing is not one we model
+        kept.append(rest_cased[pos:a])
+        pos = b
+    kept.append(rest_cased[pos:])
+    words = [w for w in ' '.join(kept).replace(',', ' ').split() if w.lower() not in _FILLER]
+    title = ' '.join(words)
+    if not title or len(words) > 6 or _TEMPORAL_LEFTOVER.search(title.lower()):
+        return FastParse(None, 0.4)
+
+    start = day.replace(hour=start_hm[0], minute=start_hm[1], second=0, microsecond=0)
+    if end_hm is not None:
+        end = day.replace(hour=end_hm[0], minute=end_hm[1], second=0, microsecond=0)
+        if end <= start:
+            return _MISS
+    else:
+        end = start + timedelta(minutes=minutes)
+    return FastParse({
+        'type': 'create_event',
+        'title': title[0].upper() + title[1:],
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+    }, 0.95)
@@ -1,7 +1,7 @@
 from typing import Any, Dict, Optional
 import os
 
-def interpret(text: str, *, model: Optional[str] = None) -> Dict[str, Any]:
+async def interpret(text: str, *, tz: str = "America/Los_Angeles", model: Optional[str] = None) -> Dict[str, Any]:
     """
     Deterministic, startup-safe orchestrator.
 
@@ -9,6 +9,7 @@ def interpret(text: str, *, model: Optional[str] = None) -> Dict[str, Any]:
     - Import the OpenAI adapter *inside* the function so module import never fails.
     - If the adapter is missing OR errors, provide a predictable fallback in AUTH_BYPASS mode.
     - Return a minimal Command-shaped dict the rest of the pipeline can consume.
+    - Reuse the process-wide adapter (and its pooled HTTP client) across calls.
     """
     # Fast path: dev fallback when AUTH_BYPASS is set
     if os.environ.get("AUTH_BYPASS") == "1":
@@ -23,10 +24,10 @@ def interpret(text: str, *, model: Optional[str] = None) -> Dict[str, Any]:
     # Production path: try the OpenAI LLM adapter (import deferred)
     try:
         # Absolute canonical path; no bare `ai.*`
-        from server.ai.adapters.openai_adapter import OpenAILLM  # type: ignore
+        from server.ai.adapters.openai_adapter import get_llm  # type: ignore
 
-        llm = OpenAILLM(model=model)
-        return llm.interpret(text)
+        cmd = await get_llm(model).interpret(text, tz)
+        return cmd.model_dump()
     except Exception as e:
         raise RuntimeError(
             f"LLM adapter failed in orchestrator: {type(e).__name__}: {e}. "
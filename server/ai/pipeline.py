@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from server.ai.cache import InterpretCache, normalize
+from server.ai.nlp import fast_parse
+from server.ai.singleflight import SingleFlight
+
+# Shared pooled async OpenAI client (expects OPENAI_API_KEY in env; see server/ai/client.py)
+try:
+    from server.ai.client import chat_json, chat_json_stream
+except Exception:
+    chat_json = chat_json_stream = None
+
+# Utterance -> command pipeline shared by POST /ai/interpret, /ai/execute,
+# /ai/interpret/stream and the /ws "interpret" command:
+#   rule-based fast path -> interpretation cache -> single-flighted LLM call,
+# whose validated answer is cached. Transport-agnostic: failures raise
+# InterpretError and each caller reports it in its own protocol.
+
+_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+
+_CACHE = InterpretCache()
+# Concurrent identical utterances (double taps, client retries) share one LLM call
+_INFLIGHT = SingleFlight()
+
+# Local rule-based stage ahead of the LLM; AI_FASTPATH=0 turns it off
+_FASTPATH = (os.getenv("AI_FASTPATH") or "1").strip().lower() not in {"0", "false", "no"}
+_FASTPATH_MIN_CONFIDENCE = float(os.getenv("AI_FASTPATH_MIN_CONFIDENCE") or 0.9)
+
+SYSTEM_PROMPT = """You are a calendar command generator.
+Return ONLY a JSON object that matches one of these shapes:
+
+1) Create:
+{
+  "type": "create_event",
+  "title": "<short title>",
+  "start": "<ISO8601 with timezone, e.g. 2025-10-16T09:30:00-07:00>",
+  "end":   "<ISO8601 with timezone>"
+}
+
+2) Delete last:
+{ "op": "delete_last" }
+
+Rules:
+- If the user says "delete last", use the delete shape.
+- Otherwise assume create.
+- Use the user's timezone and current date context provided to you.
+- Never return null for start or end. If duration is spoken (e.g., "for 30 minutes"), compute end; otherwise default duration = 30 minutes.
+- If no title is provided, use "untitled".
+- Do NOT include extra top-level properties. Do NOT wrap the object in another key.
+"""
+
+class InterpretError(Exception):
+    """The utterance could not be turned into a command; status is HTTP-style."""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+def _messages(text: str, tz: str, now_iso: str) -> List[Dict[str, str]]:
+    user_context = f"""User timezone: {tz}
+Current datetime (ISO): {now_iso}
+User said: {text}"""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_context},
+    ]
+
+def parse_command(raw: str) -> Dict[str, Any]:
+    """Validate the LLM's raw JSON and normalize it to the backend contract."""
+    try:
+        cmd = json.loads(raw)
+        if not isinstance(cmd, dict):
+            raise ValueError("not an object")
+    except Exception:
+        raise InterpretError(422, "Interpreter returned non-JSON")
+
+    # Validate minimal fields and normalize to backend contract
+    if cmd.get("op") == "delete_last":
+        return {"op": "delete_last"}
+
+    # create_event defaulting
+    if cmd.get("type") != "create_event":
+        cmd["type"] = "create_event"
+    cmd.setdefault("title", "untitled")
+
+    # ensure start/end are present and ISO strings
+    if not cmd.get("start") or not cmd.get("end"):
+        raise InterpretError(422, "Interpreter missing start/end")
+    if not isinstance(cmd["start"], str) or not isinstance(cmd["end"], str):
+        raise InterpretError(422, "Interpreter produced invalid datetimes")
+
+    return cmd
+
+async def _llm_interpret(text: str, tz: str, now_iso: str) -> Dict[str, Any]:
+    if chat_json is None:
+        raise InterpretError(500, "LLM client not available on server")
+    try:
+        raw = await chat_json(_MODEL, _messages(text, tz, now_iso))
+    except RuntimeError:
+        # No API key configured
+        raise InterpretError(500, "LLM client not available on server")
+    return parse_command(raw)
+
+async def _llm_stream(text: str, tz: str, now_iso: str) -> AsyncIterator[str]:
+    if chat_json_stream is None:
+        raise InterpretError(500, "LLM client not available on server")
+    try:
+        async for delta in chat_json_stream(_MODEL, _messages(text, tz, now_iso)):
+            yield delta
+    except RuntimeError:
+        raise InterpretError(500, "LLM client not available on server")
+
+def llm_stream(text: str, tz: str) -> AsyncIterator[str]:
+    """Raw JSON deltas of an uncached LLM interpretation; feed the joined text to parse_command."""
+    return _llm_stream(text, tz, _now_iso())
+
+def _now_iso() -> str:
+    # Use server-side current timestamp (ISO) just for grounding
+    return datetime.now().astimezone().isoformat()
+
+def quick_interpret(text: str, tz: str, now: float) -> Optional[Dict[str, Any]]:
+    """An answer that needs no LLM call (the fast path, then the cache), else None."""
+    if _FASTPATH:
+        try:
+            fast = fast_parse(text, tz)
+        except Exception:  # unknown tz etc.: leave it to the LLM
+            fast = None
+        if fast and fast.command and fast.confidence >= _FASTPATH_MIN_CONFIDENCE:
+            return fast.command
+    return _CACHE.get(text, tz, now)
+
+def remember(text: str, tz: str, cmd: Dict[str, Any], now: float) -> None:
+    """Cache a validated command for text, as interpreted at `now`."""
+    _CACHE.put(text, tz, cmd, now)
+
+async def interpret(text: str, tz: str, user_id: str) -> Dict[str, Any]:
+    """The command for text in tz; raises InterpretError when there is none."""
+    now = time.time()
+    cmd = quick_interpret(text, tz, now)
+    if cmd is not None:
+        return cmd
+
+    async def call() -> Dict[str, Any]:
+        cmd = await _llm_interpret(text=text, tz=tz, now_iso=_now_iso())
+        # Only validated commands reach the cache: _llm_interpret raises otherwise
+        remember(text, tz, cmd, now)
+        return cmd
+
+    return await _INFLIGHT.do((user_id, normalize(text), tz), call)
+
+def stats() -> Dict[str, Any]:
+    # Interpretation cache metrics: size, hits, misses, evictions, hit_rate,
+    # plus single-flight counters (calls started vs. duplicates that joined one)
+    return {**_CACHE.stats(), "singleflight": _INFLIGHT.stats()}
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and each receive a deep copy of its
+    result (or its exception). Waiters are shielded, so a client that
+    disconnects does not cancel the call for the others. The key is forgotten
+    as soon as the call finishes: this de-duplicates in-flight work only, and
+    caching results is left to the caller.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.joined = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.joined += 1
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    def stats(self) -> Dict[str, int]:
+        return {"inflight": len(self._calls), "leaders": self.leaders, "joined": self.joined}
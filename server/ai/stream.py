@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+class FieldStream:
+    """
+    Incremental parser for a streamed JSON object.
+
+    feed() takes raw text chunks as the LLM emits them and returns the
+    top-level fields that became complete with that chunk, so callers can show
+    "action", "title", "start", ... before the closing brace arrives. Nested
+    values (objects, arrays) are reported once whole. Only string/escape state
+    and nesting depth are tracked; each finished "key": value segment is handed
+    to json.loads.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._seg_start: Optional[int] = None
+        self.done = False
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        self._text += chunk
+        new: Dict[str, Any] = {}
+        text = self._text
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == "\\":
+                    self._esc = True
+                elif c == '"':
+                    self._in_str = False
+                continue
+            if c == '"':
+                self._in_str = True
+            elif c in "{[":
+                self._depth += 1
+                if self._depth == 1 and c == "{":
+                    self._seg_start = i + 1
+            elif c in "}]":
+                if self._depth == 1 and c == "}":
+                    self._complete(text[self._seg_start:i], new)
+                    self.done = True
+                self._depth -= 1
+            elif c == "," and self._depth == 1:
+                self._complete(text[self._seg_start:i], new)
+                self._seg_start = i + 1
+        self._pos = len(text)
+        return new
+
+    def _complete(self, segment: str, new: Dict[str, Any]) -> None:
+        if not segment.strip():
+            return
+        try:
+            pair = json.loads("{" + segment + "}")
+        except ValueError:
+            return
+        self.fields.update(pair)
+        new.update(pair)
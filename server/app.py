@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
 from db.session import init_db
 from routers import events, ws, ai
+from utils.connections import manager
 
 app = FastAPI(title="Voice Calendar Prototype")
 app.add_middleware(
@@ -19,8 +20,13 @@ app.include_router(ai.router)
 app.include_router(ws.router)
 
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     init_db()
+    await manager.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await manager.stop()
 
 if __name__ == "__main__":
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# ISO instant parsing and the window-overlap rule shared by the calendar stores
+# (store, store_sqlite and providers.memory), so all three agree on what a
+# time-range query returns.
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Open-ended window bounds, in epoch seconds
+FAR_PAST = -(1 << 62)
+FAR_FUTURE = 1 << 62
+
+
+def epoch_us(value: object) -> Optional[int]:
+    """Epoch microseconds for an ISO string (naive is read as UTC), else None."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def epoch_s(value: object) -> Optional[int]:
+    us = epoch_us(value)
+    return None if us is None else us // 1_000_000
+
+
+def bound_s(value: Optional[str], default: int) -> int:
+    """A window bound in epoch seconds; `default` when unset, ValueError when unparseable."""
+    if not value:
+        return default
+    bound = epoch_s(value)
+    if bound is None:
+        raise ValueError(f"invalid datetime: {value!r}")
+    return bound
+
+
+def overlaps(start_s: int, end_s: Optional[int], lo: int) -> bool:
+    """Whether an event that starts before the window's end overlaps a window starting at lo."""
+    return start_s >= lo or (end_s is not None and end_s > lo)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+import os
+import threading
+from typing import List
+
+# Number of lock stripes shared by the calendar stores. Users hash onto a fixed
+# pool so unrelated users rarely contend, without growing a lock per user forever.
+_DEFAULT_STRIPES = int(os.getenv("CAL_LOCK_STRIPES") or 64)
+
+
+class LockStripes:
+    """Fixed pool of re-entrant locks; a given key always maps to the same lock."""
+
+    def __init__(self, n: int = _DEFAULT_STRIPES) -> None:
+        self._locks: List[threading.RLock] = [threading.RLock() for _ in range(max(1, n))]
+
+    def for_key(self, key: str) -> threading.RLock:
+        return self._locks[hash(key) % len(self._locks)]
@@ -1,54 +1,276 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta, timezone
-import threading
+from typing import Dict, List, Optional, Any, Tuple, Union
+from datetime import datetime, timedelta
+import bisect
+import sys
+import time
 import uuid
 
+from .instants import EPOCH as _EPOCH, FAR_FUTURE, FAR_PAST, bound_s, epoch_us, overlaps
+from .locks import LockStripes
+
 # =========================
 # Models
 # =========================
+# Compact representation: events and ops are __slots__ objects, instants are
+# integer epochs and titles are interned. The op log references the same Event
+# objects the view does, so nothing is stored twice. JSON is rendered on demand.
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Event:
     id: str
-    title: str
-    start: str  # ISO string (e.g. 2025-10-21T17:18:01Z)
-    end: str    # ISO string or "" if unknown
-    data: Dict[str, Any]
-    created_at: str  # ISO with offset
+    title: str                      # interned
+    start: Union[int, str, None]    # epoch seconds; raw string if it would not round-trip
+    end: Union[int, str, None]      # epoch seconds, raw string, or None if unknown
+    data: Optional[Dict[str, Any]]  # None instead of an empty dict per event
+    created_us: int                 # epoch microseconds
 
     def to_json(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "title": self.title,
-            "start": self.start,
-            "end": self.end,
-            "data": self.data,
-            "created_at": self.created_at,
+            "start": _iso_from_epoch(self.start),
+            "end": _iso_from_epoch(self.end),
+            "data": dict(self.data) if self.data else {},
+            "created_at": _iso_from_us(self.created_us),
         }
 
+@dataclass(slots=True, eq=False)
+class _Op:
+    kind: str
+    event: Event
+    ts_us: int  # epoch microseconds
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "event": self.event.to_json(), "ts": _iso_from_us(self.ts_us)}
+
 # =========================
 # Per-user in-memory state
 # =========================
-# Current event list (derived from the operation log)
-_STORE: Dict[str, List[Event]] = {}
-
-# Operation log (newest-last). Each entry:
-#   { "kind": "create", "event": <event_json>, "ts": <iso> }
+# Operation log (newest-last); each entry is an _Op ("create" is the only kind).
 # We prune this log on undo/replay so history reflects the current timeline.
-_OPLOG: Dict[str, List[Dict[str, Any]]] = {}
+_OPLOG: Dict[str, List[_Op]] = {}
+
+# Time-travel indexes, kept parallel to _OPLOG:
+#   _TS_INDEX[user][i]   == _OPLOG[user][i].ts_us (non-decreasing, so bisectable)
+#   _CHECKPOINTS[user][j] == number of events in the view after the first
+#                            j*_CHECKPOINT_EVERY ops
+# Ops only ever append to the view in log order, so the view after any prefix of
+# the log is a prefix of the current view; a checkpoint only needs its length.
+_TS_INDEX: Dict[str, List[int]] = {}
+_CHECKPOINTS: Dict[str, List[int]] = {}
+_CHECKPOINT_EVERY = 256
+
+# Read snapshots (RCU style): every mutation publishes a fresh immutable snapshot
+# that is also the materialized event view; readers grab it with a single dict
+# lookup and never take the lock. The view and the op history are persistent
+# chunked sequences (_Seq), so publishing copies at most one _CHUNK-sized tail
+# and never the whole calendar. Serialized JSON and the interval index for
+# time-range queries are built per chunk by the first reader that needs them;
+# chunks are shared by every later snapshot, so repeated reads never redo that
+# work. The dicts inside are shared and must not be mutated.
+_CHUNK = 256
+
+# (sorted (start_s, offset) keys, max span s, min start s, max start s)
+_Index = Tuple[Tuple[Tuple[int, int], ...], int, int, int]
+
+def _run_index(items: Tuple[Event, ...]) -> _Index:
+    keys: List[Tuple[int, int]] = []
+    span = 0
+    for off, ev in enumerate(items):
+        key = _index_key(ev, off)
+        if key is not None:
+            keys.append(key)
+            span = max(span, _span_s(ev))
+    keys.sort()
+    if not keys:
+        return ((), 0, 0, -1)
+    return (tuple(keys), span, keys[0][0], keys[-1][0])
+
+class _Chunk:
+    """A full, immutable run of _CHUNK entries plus read caches filled on first use."""
+    __slots__ = ("items", "json", "index")
+
+    def __init__(self, items: Tuple[Any, ...]) -> None:
+        self.items = items
+        self.json: Optional[Tuple[Dict[str, Any], ...]] = None
+        self.index: Optional[_Index] = None
+
+class _Seq:
+    """Persistent append-only sequence with O(_CHUNK) append and prefix truncation.
+
+    Full chunks live in a list shared by every version derived from the same
+    one; a version only reads its first `count` of them, so pushing a chunk is an
+    in-place list append and truncating just publishes a smaller count. Only the
+    short `tail` tuple is copied per append.
+    """
+    __slots__ = ("chunks", "count", "tail")
+
+    def __init__(self, chunks: Optional[List[_Chunk]] = None, count: int = 0, tail: Tuple[Any, ...] = ()) -> None:
+        self.chunks = chunks if chunks is not None else []
+        self.count = count
+        self.tail = tail
+
+    @classmethod
+    def of(cls, items) -> "_Seq":
+        items = tuple(items)
+        full = len(items) - len(items) % _CHUNK
+        chunks = [_Chunk(items[i:i + _CHUNK]) for i in range(0, full, _CHUNK)]
+        return cls(chunks, len(chunks), items[full:])
+
+    def __len__(self) -> int:
+        return self.count * _CHUNK + len(self.tail)
+
+    def __getitem__(self, i: int) -> Any:
+        c, r = divmod(i, _CHUNK)
+        return self.chunks[c].items[r] if c < self.count else self.tail[r]
+
+    def __iter__(self):
+        for chunk in self.chunks[:self.count]:
+            yield from chunk.items
+        yield from self.tail
+
+    def full_chunks(self) -> List[_Chunk]:
+        return self.chunks[:self.count]
 
-# IMPORTANT: use a re-entrant lock to avoid deadlock when a locked function
+    def append(self, item: Any) -> "_Seq":
+        tail = self.tail + (item,)
+        if len(tail) < _CHUNK:
+            return _Seq(self.chunks, self.count, tail)
+        chunks = self.chunks
+        if len(chunks) != self.count:
+            # Later chunks belong to an older, longer version that readers may still hold
+            chunks = chunks[:self.count]
+        chunks.append(_Chunk(tail))
+        return _Seq(chunks, self.count + 1, ())
+
+    def truncate(self, n: int) -> "_Seq":
+        c, r = divmod(n, _CHUNK)
+        if c >= self.count:
+            return _Seq(self.chunks, self.count, self.tail[:n - self.count * _CHUNK])
+        return _Seq(self.chunks, c, self.chunks[c].items[:r])
+
+    def newest_first(self, limit: int) -> List[Any]:
+        out = list(reversed(self.tail[-limit:]))
+        c = self.count
+        while len(out) < limit and c > 0:
+            c -= 1
+            out.extend(reversed(self.chunks[c].items[-(limit - len(out)):]))
+        return out
+
+class _Snapshot:
+    __slots__ = ("events", "ops", "version", "tail_json", "tail_index")
+
+    def __init__(
+        self,
+        events: Optional[_Seq] = None,
+        ops: Optional[_Seq] = None,
+        version: int = 0,
+        tail_json: Optional[Tuple[Dict[str, Any], ...]] = None,
+    ) -> None:
+        self.events = events if events is not None else _Seq()  # current view, oldest-first
+        self.ops = ops if ops is not None else _Seq()           # op log as of this snapshot
+        self.version = version        # bumped by every publish; monotonic per user
+        self.tail_json = tail_json    # events.tail rendered via to_json, or None until first read
+        self.tail_index: Optional[_Index] = None
+
+    def events_json(self, cache: bool = True) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for chunk in self.events.full_chunks():
+            rendered = chunk.json
+            if rendered is None:
+                rendered = tuple(e.to_json() for e in chunk.items)
+                if cache:
+                    chunk.json = rendered
+            out.extend(rendered)
+        rendered = self.tail_json
+        if rendered is None:
+            rendered = tuple(e.to_json() for e in self.events.tail)
+            if cache:
+                self.tail_json = rendered
+        out.extend(rendered)
+        return out
+
+    def event_json(self, pos: int) -> Dict[str, Any]:
+        c, r = divmod(pos, _CHUNK)
+        rendered = self.events.chunks[c].json if c < self.events.count else self.tail_json
+        return rendered[r] if rendered is not None else self.events[pos].to_json()
+
+    def interval_runs(self):
+        """Yield (base position, index) per chunk of the view, tail last."""
+        for c, chunk in enumerate(self.events.full_chunks()):
+            if chunk.index is None:
+                chunk.index = _run_index(chunk.items)
+            yield c * _CHUNK, chunk.index
+        if self.tail_index is None:
+            self.tail_index = _run_index(self.events.tail)
+        yield self.events.count * _CHUNK, self.tail_index
+
+_HISTORY_MAX = 500
+_EMPTY_SNAPSHOT = _Snapshot()  # read-only stand-in for unknown users
+_SNAPSHOTS: Dict[str, _Snapshot] = {}
+
+# Per-user lock stripes: each user's structures are guarded by the stripe its id
+# hashes to, so independent users read and mutate in parallel.
+# IMPORTANT: stripes are re-entrant locks to avoid deadlock when a locked function
 # calls another function that also reads the same structures.
-_LOCK = threading.RLock()
+_LOCKS = LockStripes()
+
+def _lock_for(user_id: str):
+    return _LOCKS.for_key(user_id)
 
 # =========================
 # Helpers
 # =========================
 
-def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+def _iso_from_us(us: int) -> str:
+    return (_EPOCH + timedelta(microseconds=us)).isoformat()
+
+def _epoch_from_iso(value: Optional[str]) -> Union[int, str, None]:
+    """Compact an ISO instant to epoch seconds.
+
+    Values that would not render back identically in the canonical
+    "YYYY-MM-DDTHH:MM:SSZ" form (naive, sub-second or unparseable) stay strings;
+    offset-qualified instants are normalized to UTC.
+    """
+    if not value:
+        return None
+    value = str(value)
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if dt.tzinfo is None or dt.microsecond:
+        return value
+    return (dt - _EPOCH) // timedelta(seconds=1)
+
+def _iso_from_epoch(value: Union[int, str, None]) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return (_EPOCH + timedelta(seconds=value)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _instant_s(value: Union[int, str, None]) -> Optional[int]:
+    """Epoch seconds for a stored start/end; naive strings are read as UTC."""
+    if value is None or isinstance(value, int):
+        return value
+    us = epoch_us(value)
+    return None if us is None else us // 1_000_000
+
+def _index_key(ev: Event, pos: int) -> Optional[Tuple[int, int]]:
+    start_s = _instant_s(ev.start)
+    return None if start_s is None else (start_s, pos)
+
+def _span_s(ev: Event) -> int:
+    start_s, end_s = _instant_s(ev.start), _instant_s(ev.end)
+    if start_s is None or end_s is None:
+        return 0
+    return max(0, end_s - start_s)
 
 def _default_end_from(start_iso: str) -> str:
     try:
@@ -58,105 +280,210 @@ def _default_end_from(start_iso: str) -> str:
         return ""
 
 def _ensure_user(user_id: str) -> None:
-    if user_id not in _STORE:
-        _STORE[user_id] = []
     if user_id not in _OPLOG:
         _OPLOG[user_id] = []
+    if user_id not in _TS_INDEX:
+        _TS_INDEX[user_id] = []
+        _CHECKPOINTS[user_id] = [0]
+    if user_id not in _SNAPSHOTS:
+        # Fresh per user: chunk lists are shared along one user's versions only
+        _SNAPSHOTS[user_id] = _Snapshot()
+
+def _publish(
+    user_id: str,
+    events: _Seq,
+    ops: _Seq,
+    tail_json: Optional[Tuple[Dict[str, Any], ...]] = None,
+) -> None:
+    """Swap in a new read snapshot for user_id (caller holds the user's lock)."""
+    _SNAPSHOTS[user_id] = _Snapshot(
+        events=events,
+        ops=ops,
+        version=_SNAPSHOTS[user_id].version + 1,
+        tail_json=tail_json,
+    )
+
+def _append_entry(user_id: str, op: _Op) -> None:
+    """Append an op to the log and keep the view and time-travel indexes in step."""
+    log = _OPLOG[user_id]
+    ts_index = _TS_INDEX[user_id]
+    # Clamp to the previous ts so the index stays sorted across clock steps.
+    if ts_index and op.ts_us < ts_index[-1]:
+        op.ts_us = ts_index[-1]
+    log.append(op)
+    ts_index.append(op.ts_us)
+    prev = _SNAPSHOTS[user_id]
+    events, tail_json = prev.events, None
+    if op.kind == "create":
+        events = events.append(op.event)
+        if prev.tail_json is not None:
+            # Carry a listed user's serialized tail forward instead of dropping it
+            rendered = prev.tail_json + (op.event.to_json(),)
+            if events.tail:
+                tail_json = rendered
+            else:
+                events.chunks[events.count - 1].json = rendered
+    if len(log) % _CHECKPOINT_EVERY == 0:
+        _CHECKPOINTS[user_id].append(len(events))
+    _publish(user_id, events, prev.ops.append(op), tail_json)
+
+def _truncate_log(user_id: str, keep: int) -> List[_Op]:
+    """Drop every op after the first `keep`, restoring the view from the nearest checkpoint.
+
+    Returns the removed entries oldest-first. Cost is O(removed + _CHECKPOINT_EVERY
+    + _CHUNK), independent of how much history is kept.
+    """
+    log = _OPLOG[user_id]
+    keep = max(0, min(keep, len(log)))
+    removed = log[keep:]
+    if not removed:
+        return removed
+    cp = keep // _CHECKPOINT_EVERY
+    view_len = _CHECKPOINTS[user_id][cp]
+    for op in log[cp * _CHECKPOINT_EVERY:keep]:
+        if op.kind == "create":
+            view_len += 1
+    del log[keep:]
+    del _TS_INDEX[user_id][keep:]
+    del _CHECKPOINTS[user_id][cp + 1:]
+    prev = _SNAPSHOTS[user_id]
+    events = prev.events.truncate(view_len)
+    rendered = prev.tail_json if events.count == prev.events.count else events.chunks[events.count].json
+    tail_json = rendered[:len(events.tail)] if rendered is not None else None
+    _publish(user_id, events, prev.ops.truncate(keep), tail_json)
+    return removed
 
 def _rebuild_from_log(user_id: str) -> None:
-    """Recompute the current event list from the pruned operation log."""
+    """Recompute the current event view and indexes from the pruned operation log.
+
+    Mutations maintain the view incrementally via _append_entry/_truncate_log;
+    this full O(history) walk is only the recovery/verification path.
+    """
     events: List[Event] = []
-    for entry in _OPLOG[user_id]:
-        if entry.get("kind") == "create":
-            d = entry["event"]
-            events.append(Event(
-                id=str(d.get("id")),
-                title=str(d.get("title", "untitled")),
-                start=str(d.get("start", "")),
-                end=str(d.get("end", "")),
-                data=dict(d.get("data") or {}),
-                created_at=str(d.get("created_at") or _now_iso()),
-            ))
-    _STORE[user_id] = events
-
-def _events_json_unlocked(user_id: str) -> List[Dict[str, Any]]:
-    """Return events JSON without acquiring the lock (caller already holds it)."""
-    return [e.to_json() for e in _STORE[user_id]]
+    checkpoints = [0]
+    for i, op in enumerate(_OPLOG[user_id], 1):
+        if op.kind == "create":
+            events.append(op.event)
+        if i % _CHECKPOINT_EVERY == 0:
+            checkpoints.append(len(events))
+    _TS_INDEX[user_id] = [op.ts_us for op in _OPLOG[user_id]]
+    _CHECKPOINTS[user_id] = checkpoints
+    _publish(user_id, _Seq.of(events), _Seq.of(_OPLOG[user_id]))
+
+def _materialized_matches_log(user_id: str) -> bool:
+    """True if the incrementally maintained view (and its serialized caches) equals a full rebuild.
+
+    The view is replaced by the rebuilt one either way, so this doubles as repair.
+    """
+    prev = _SNAPSHOTS[user_id]
+    current = [e.to_json() for e in prev.events]
+    published = prev.events_json(cache=False)
+    ops = list(prev.ops)
+    checkpoints = list(_CHECKPOINTS[user_id])
+    _rebuild_from_log(user_id)
+    rebuilt = [e.to_json() for e in _SNAPSHOTS[user_id].events]
+    return (current == rebuilt and published == rebuilt and ops == _OPLOG[user_id]
+            and checkpoints == _CHECKPOINTS[user_id])
+
+def _events_json_unlocked(user_id: str, cache: bool = False) -> List[Dict[str, Any]]:
+    """Return events JSON from the published snapshot (never needs the lock).
+
+    Only list_events populates the snapshot's serialized cache; mutation
+    responses render without it so users who never read stay compact.
+    """
+    return _SNAPSHOTS.get(user_id, _EMPTY_SNAPSHOT).events_json(cache=cache)
 
 def _history_newest_first(user_id: str, limit: int) -> Dict[str, Any]:
-    items = list(reversed(_OPLOG[user_id]))[: max(1, min(500, limit))]
+    snap = _SNAPSHOTS.get(user_id, _EMPTY_SNAPSHOT)
     return {
         "user_id": user_id,
         "limit": limit,
-        "items": items,  # [{kind:"create", event:{...}, ts}]
-        "total": len(_OPLOG[user_id]),
+        "items": [op.to_json() for op in snap.ops.newest_first(max(1, min(_HISTORY_MAX, limit)))],  # [{kind:"create", event:{...}, ts}]
+        "total": len(snap.ops),
     }
 
+def _events_in_window(user_id: str, start_s: int, end_s: int) -> List[Dict[str, Any]]:
+    """Events overlapping [start_s, end_s), ordered by start.
+
+    Each chunk's index is bisected for starts in [start_s - max_span, end_s);
+    chunks whose start range misses that window are skipped without a search.
+    A zero-length event counts when its start falls inside the window.
+    Unparseable starts are never listed.
+    """
+    snap = _SNAPSHOTS.get(user_id, _EMPTY_SNAPSHOT)
+    hits: List[Tuple[int, int]] = []
+    for base, (keys, max_span, lo_start, hi_start) in snap.interval_runs():
+        if not keys or hi_start < start_s - max_span or lo_start >= end_s:
+            continue
+        lo = bisect.bisect_left(keys, (start_s - max_span,))
+        hi = bisect.bisect_left(keys, (end_s,))
+        for ev_start, off in keys[lo:hi]:
+            ev_end = _instant_s(snap.events[base + off].end)
+            if overlaps(ev_start, ev_end, start_s):
+                hits.append((ev_start, base + off))
+    hits.sort()
+    return [snap.event_json(pos) for _, pos in hits]
+
 # =========================
 # Public read API
 # =========================
+# Lock-free: both read whatever snapshot the last completed mutation published.
 
-def list_events(user_id: str) -> List[Dict[str, Any]]:
-    with _LOCK:
-        _ensure_user(user_id)
-        return _events_json_unlocked(user_id)
+def list_events(user_id: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+    """All events in creation order, or with start/end (ISO) only those overlapping
+    [start, end), ordered by start. Raises ValueError for an unparseable bound."""
+    if start or end:
+        return _events_in_window(user_id, bound_s(start, FAR_PAST), bound_s(end, FAR_FUTURE))
+    return _events_json_unlocked(user_id, cache=True)
 
 def history(user_id: str, limit: int = 50) -> Dict[str, Any]:
-    with _LOCK:
-        _ensure_user(user_id)
-        return _history_newest_first(user_id, limit)
+    return _history_newest_first(user_id, limit)
 
 # =========================
 # Mutations
 # =========================
 
-def _create_event(user_id: str, title: str, start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
-    start_iso = (start or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
-    end_iso = (end if end is not None and end != "" else _default_end_from(start_iso))
-    ev = Event(
+def _new_event(title: str, start: Optional[str], end: Optional[str], now_us: int) -> Event:
+    start_val = _epoch_from_iso(start) if start else now_us // 1_000_000
+    if end is not None and end != "":
+        end_val = _epoch_from_iso(end)
+    elif isinstance(start_val, int):
+        end_val = start_val + 3600
+    else:
+        end_val = _epoch_from_iso(_default_end_from(start_val))
+    return Event(
         id=str(uuid.uuid4()),
-        title=title or "untitled",
-        start=start_iso,
-        end=end_iso,
-        data={},
-        created_at=_now_iso(),
+        title=sys.intern(title or "untitled"),
+        start=start_val,
+        end=end_val,
+        data=None,
+        created_us=now_us,
     )
-    _OPLOG[user_id].append({"kind": "create", "event": ev.to_json(), "ts": _now_iso()})
-    _rebuild_from_log(user_id)
-    return {
-        "status": "ok",
-        "diff": {"type": "create", "event": ev.to_json()},
-        "events": _events_json_unlocked(user_id),
-    }
+
+def _create_event(user_id: str, title: str, start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+    now_us = _now_us()
+    ev = _new_event(title, start, end, now_us)
+    _append_entry(user_id, _Op(kind="create", event=ev, ts_us=now_us))
+    return {"status": "ok", "diff": {"type": "create", "event": ev.to_json()}}
 
 def _delete_last(user_id: str) -> Dict[str, Any]:
     # Legacy single-step undo = remove the last create operation
     if not _OPLOG[user_id]:
-        _STORE[user_id] = []
-        return {"status": "ok", "diff": {"type": "undo", "undo_of": "noop"}, "events": []}
-    last = _OPLOG[user_id].pop()
-    deleted_event = last.get("event")
-    _rebuild_from_log(user_id)
-    return {
-        "status": "ok",
-        "diff": {"type": "undo", "undo_of": "create", "event": deleted_event},
-        "events": _events_json_unlocked(user_id),
-    }
+        return {"status": "ok", "diff": {"type": "undo", "undo_of": "noop"}}
+    last = _truncate_log(user_id, len(_OPLOG[user_id]) - 1)[0]
+    deleted_event = last.event.to_json()
+    return {"status": "ok", "diff": {"type": "undo", "undo_of": "create", "event": deleted_event}}
 
 def _undo_n(user_id: str, n: int) -> Dict[str, Any]:
     if n <= 0 or not _OPLOG[user_id]:
-        return {"status": "ok", "diff": {"type": "undo_batch", "count": 0, "diffs": []}, "events": list_events(user_id)}
+        return {"status": "ok", "diff": {"type": "undo_batch", "count": 0, "diffs": []}}
     count = min(n, len(_OPLOG[user_id]))
-    diffs: List[Dict[str, Any]] = []
-    for _ in range(count):
-        entry = _OPLOG[user_id].pop()
-        diffs.append({"type": "undo", "undo_of": entry.get("kind", "create"), "event": entry.get("event")})
-    _rebuild_from_log(user_id)
-    return {
-        "status": "ok",
-        "diff": {"type": "undo_batch", "count": count, "diffs": diffs},
-        "events": _events_json_unlocked(user_id),
-    }
+    removed = _truncate_log(user_id, len(_OPLOG[user_id]) - count)
+    return {"status": "ok", "diff": {"type": "undo_batch", "count": count, "diffs": _undo_diffs(removed)}}
+
+def _undo_diffs(removed: List[_Op]) -> List[Dict[str, Any]]:
+    # Newest-first, one per removed op, so delta-only clients can drop them
+    return [{"type": "undo", "undo_of": op.kind, "event": op.event.to_json()} for op in reversed(removed)]
 
 def _replay_n(user_id: str, n: int) -> Dict[str, Any]:
     # For this legacy contract, "replay_n" means restore to the state n steps before the latest.
@@ -165,45 +492,100 @@ def _replay_n(user_id: str, n: int) -> Dict[str, Any]:
 def _replay_to_ts(user_id: str, ts_iso: str) -> Dict[str, Any]:
     # Restore to the latest state whose operation timestamp <= ts_iso
     if not ts_iso:
-        return {"status": "error", "error": "missing_ts", "events": list_events(user_id)}
-    pruned: List[Dict[str, Any]] = []
-    for entry in _OPLOG[user_id]:
-        ts = str(entry.get("ts", ""))
-        if ts <= ts_iso:
-            pruned.append(entry)
-    _OPLOG[user_id] = pruned
-    _rebuild_from_log(user_id)
-    return {"status": "ok", "diff": {"type": "replay", "to_ts": ts_iso}, "events": _events_json_unlocked(user_id)}
+        return {"status": "error", "error": "missing_ts"}
+    ts_us = epoch_us(ts_iso)
+    if ts_us is None:
+        return {"status": "error", "error": "invalid_ts"}
+    removed = _truncate_log(user_id, bisect.bisect_right(_TS_INDEX[user_id], ts_us))
+    return {"status": "ok", "diff": {"type": "replay", "to_ts": ts_iso, "count": len(removed), "diffs": _undo_diffs(removed)}}
 
-def apply_command(user_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+def _dispatch(user_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     op = str(payload.get("op") or "").strip()
     cmd_type = payload.get("type")
 
-    with _LOCK:
-        _ensure_user(user_id)
+    if op == "noop":
+        return {"status": "ok", "diff": {"type": "noop"}}
+
+    if op in {"delete_last", "undo_last"}:
+        return _delete_last(user_id)
 
-        if op == "noop":
-            return {"status": "ok", "diff": {"type": "noop"}, "events": _events_json_unlocked(user_id)}
+    if op == "undo_n":
+        n = int(payload.get("n") or 1)
+        return _undo_n(user_id, n)
 
-        if op in {"delete_last", "undo_last"}:
-            return _delete_last(user_id)
+    if op == "replay_n":
+        n = int(payload.get("n") or 1)
+        return _replay_n(user_id, n)
 
-        if op == "undo_n":
-            n = int(payload.get("n") or 1)
-            return _undo_n(user_id, n)
+    if op == "replay_to_ts":
+        ts = str(payload.get("ts") or "")
+        return _replay_to_ts(user_id, ts)
 
-        if op == "replay_n":
-            n = int(payload.get("n") or 1)
-            return _replay_n(user_id, n)
+    if cmd_type == "create_event":
+        title = (payload.get("title") or "untitled").strip()
+        start = payload.get("start")
+        end = payload.get("end")
+        return _create_event(user_id, title, start, end)
 
-        if op == "replay_to_ts":
-            ts = str(payload.get("ts") or "")
-            return _replay_to_ts(user_id, ts)
+    return {"status": "error", "error": "unsupported command"}
 
-        if cmd_type == "create_event":
-            title = (payload.get("title") or "untitled").strip()
-            start = payload.get("start")
-            end = payload.get("end")
-            return _create_event(user_id, title, start, end)
+def _validate(payload: Dict[str, Any]) -> Optional[str]:
+    """The error _dispatch would report for payload, checked without mutating."""
+    op = str(payload.get("op") or "").strip()
+    if op in {"undo_n", "replay_n"}:
+        try:
+            int(payload.get("n") or 1)
+        except (TypeError, ValueError):
+            return "invalid_n"
+    if op == "replay_to_ts":
+        ts = str(payload.get("ts") or "")
+        if not ts:
+            return "missing_ts"
+        if epoch_us(ts) is None:
+            return "invalid_ts"
+    if op in {"noop", "delete_last", "undo_last", "undo_n", "replay_n", "replay_to_ts"}:
+        return None
+    if payload.get("type") == "create_event":
+        for field in ("title", "start", "end"):
+            if not isinstance(payload.get(field) or "", str):
+                return f"invalid_{field}"
+        return None
+    return "unsupported command"
 
-        return {"status": "error", "error": "unsupported command", "events": _events_json_unlocked(user_id)}
+def apply_command(user_id: str, payload: Dict[str, Any], include_events: bool = True) -> Dict[str, Any]:
+    """Apply one command and return {"status", "diff", "version", "events"}.
+
+    `version` is the user's monotonically increasing state version. With
+    include_events=False the full "events" array is omitted (delta-only mode),
+    so the response costs O(1) instead of O(calendar).
+    """
+    with _lock_for(user_id):
+        _ensure_user(user_id)
+        result = _dispatch(user_id, payload)
+        result["version"] = _SNAPSHOTS[user_id].version
+        if include_events:
+            result["events"] = _events_json_unlocked(user_id)
+        return result
+
+def apply_batch(user_id: str, payloads: List[Dict[str, Any]], include_events: bool = True) -> Dict[str, Any]:
+    """Apply several commands atomically under one lock acquisition.
+
+    Every command is validated first, so either all apply or none do; on failure
+    the response is {"status": "error", "error", "index"} and nothing changed.
+    The diff is {"type": "batch", "count", "diffs"} with one entry per command.
+    """
+    with _lock_for(user_id):
+        _ensure_user(user_id)
+        for i, payload in enumerate(payloads):
+            err = _validate(payload)
+            if err:
+                return {"status": "error", "error": err, "index": i, "version": _SNAPSHOTS[user_id].version}
+        diffs = [_dispatch(user_id, payload)["diff"] for payload in payloads]
+        result: Dict[str, Any] = {
+            "status": "ok",
+            "diff": {"type": "batch", "count": len(diffs), "diffs": diffs},
+            "version": _SNAPSHOTS[user_id].version,
+        }
+        if include_events:
+            result["events"] = _events_json_unlocked(user_id)
+        return result
@@ -1,20 +1,61 @@
 from __future__ import annotations
 import os, sqlite3, threading, uuid, json
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from .instants import FAR_FUTURE, FAR_PAST, bound_s, epoch_s, epoch_us
+from .locks import LockStripes
 
 _DB_PATH = os.getenv("CAL_DB_PATH") or os.path.join("server", "data", "app.db")
 os.makedirs(os.path.dirname(_DB_PATH), exist_ok=True)
 
-_LOCK = threading.RLock()
+# Per-user lock stripes (see locks.py); SQLite itself serializes the actual writes.
+_LOCKS = LockStripes()
 
-def _conn() -> sqlite3.Connection:
-    c = sqlite3.connect(_DB_PATH, check_same_thread=False)
+# Connection tuning. Each thread keeps one persistent connection (the server's
+# threadpool reuses its threads), so pragmas are paid once and sqlite3's
+# per-connection statement cache turns our fixed SQL into reused prepared statements.
+_MMAP_BYTES = int(os.getenv("CAL_DB_MMAP_BYTES") or 256 * 1024 * 1024)
+_CACHE_KIB = int(os.getenv("CAL_DB_CACHE_KIB") or 16 * 1024)
+_BUSY_TIMEOUT_MS = 5000
+_STATEMENT_CACHE = 256
+
+_LOCAL = threading.local()
+
+def _open() -> sqlite3.Connection:
+    c = sqlite3.connect(
+        _DB_PATH,
+        check_same_thread=False,
+        timeout=_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=_STATEMENT_CACHE,
+    )
     c.row_factory = sqlite3.Row
+    # WAL lets readers run alongside the single writer; NORMAL is durable across
+    # app crashes in WAL mode and only skips the per-commit fsync of the WAL.
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
+    c.execute(f"PRAGMA mmap_size={_MMAP_BYTES}")
+    c.execute(f"PRAGMA cache_size=-{_CACHE_KIB}")
+    c.execute("PRAGMA temp_store=MEMORY")
+    c.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+    return c
+
+def _conn() -> sqlite3.Connection:
+    """This thread's persistent connection (reopened if CAL_DB_PATH was repointed).
+
+    Use as `with _conn() as cx:`; the context manager commits/rolls back but does
+    not close, which is exactly what a reused connection wants.
+    """
+    c = getattr(_LOCAL, "conn", None)
+    if c is None or _LOCAL.path != _DB_PATH:
+        if c is not None:
+            c.close()
+        c = _LOCAL.conn = _open()
+        _LOCAL.path = _DB_PATH
     return c
 
 def _init():
-    with _LOCK, _conn() as cx:
+    with _conn() as cx:
         cx.execute("""
         CREATE TABLE IF NOT EXISTS events (
           id TEXT PRIMARY KEY,
@@ -32,27 +73,109 @@ def _init():
           kind TEXT NOT NULL,
           payload TEXT
         )""")
+        _migrate(cx)
         cx.commit()
 
+def _span_s(start_s: Optional[int], end_s: Optional[int]) -> int:
+    if start_s is None or end_s is None:
+        return 0
+    return max(0, end_s - start_s)
+
+def _m1_time_range_index(cx: sqlite3.Connection) -> None:
+    # Integer start/end for range queries, plus a per-user upper bound on event
+    # length so an overlap query can stay a bounded range scan on (user_id, start_s).
+    cx.execute("ALTER TABLE events ADD COLUMN start_s INTEGER")
+    cx.execute("ALTER TABLE events ADD COLUMN end_s INTEGER")
+    cx.execute("""
+    CREATE TABLE IF NOT EXISTS event_spans (
+      user_id TEXT PRIMARY KEY,
+      max_span INTEGER NOT NULL
+    )""")
+    rows = cx.execute("SELECT id, user_id, start, end FROM events").fetchall()
+    spans: Dict[str, int] = {}
+    updates = []
+    for r in rows:
+        start_s, end_s = epoch_s(r["start"]), epoch_s(r["end"])
+        updates.append((start_s, end_s, r["id"]))
+        spans[r["user_id"]] = max(spans.get(r["user_id"], 0), _span_s(start_s, end_s))
+    cx.executemany("UPDATE events SET start_s=?, end_s=? WHERE id=?", updates)
+    cx.executemany("INSERT INTO event_spans (user_id, max_span) VALUES (?,?)", list(spans.items()))
+    cx.execute("CREATE INDEX IF NOT EXISTS idx_events_user_start ON events (user_id, start_s)")
+
+def _m2_sortable_created_and_hot_indexes(cx: sqlite3.Connection) -> None:
+    # created_at is ISO text with whatever local offset the server had, so it does
+    # not sort correctly as text; created_us is the sortable integer form. The
+    # indexes cover the newest-first listing/delete_last and the history query.
+    cx.execute("ALTER TABLE events ADD COLUMN created_us INTEGER")
+    rows = cx.execute("SELECT id, created_at FROM events").fetchall()
+    cx.executemany(
+        "UPDATE events SET created_us=? WHERE id=?",
+        [(epoch_us(r["created_at"]), r["id"]) for r in rows],
+    )
+    cx.execute("CREATE INDEX IF NOT EXISTS idx_events_user_created ON events (user_id, created_us, id)")
+    cx.execute("CREATE INDEX IF NOT EXISTS idx_op_log_user_id ON op_log (user_id, id)")
+
+# Schema migrations, applied in order; PRAGMA user_version records how many ran.
+_MIGRATIONS = [_m1_time_range_index, _m2_sortable_created_and_hot_indexes]
+
+# Hot queries, kept here so tests can EXPLAIN exactly what runs in production.
+_SQL_LIST = (
+    "SELECT id, title, start, end, created_at FROM events WHERE user_id=? ORDER BY created_us DESC"
+)
+_SQL_LAST_ID = "SELECT id FROM events WHERE user_id=? ORDER BY created_us DESC LIMIT 1"
+_SQL_WINDOW = (
+    "SELECT id, title, start, end, created_at FROM events"
+    " WHERE user_id=? AND start_s >= ? AND start_s < ? AND (start_s >= ? OR end_s > ?)"
+    " ORDER BY start_s"
+)
+_SQL_HISTORY = "SELECT id, ts, kind, payload FROM op_log WHERE user_id=? ORDER BY id DESC LIMIT ?"
+_SQL_LAST_OP_ID = "SELECT MAX(id) FROM op_log WHERE user_id=?"
+
+_SQL_INSERT_EVENT = (
+    "INSERT INTO events (id, user_id, title, start, end, created_at, start_s, end_s, created_us)"
+    " VALUES (?,?,?,?,?,?,?,?,?)"
+)
+_SQL_UPSERT_SPAN = (
+    "INSERT INTO event_spans (user_id, max_span) VALUES (?,?)"
+    " ON CONFLICT(user_id) DO UPDATE SET max_span = MAX(max_span, excluded.max_span)"
+)
+_SQL_INSERT_OP = "INSERT INTO op_log (user_id, ts, kind, payload) VALUES (?,?,?,?)"
+
+def _migrate(cx: sqlite3.Connection) -> None:
+    version = cx.execute("PRAGMA user_version").fetchone()[0]
+    for target, step in enumerate(_MIGRATIONS, 1):
+        if version < target:
+            step(cx)
+            cx.execute(f"PRAGMA user_version = {target}")
+
 _init()
 
 def _now_iso() -> str:
     return datetime.now().astimezone().isoformat()
 
-def list_events(user_id: str) -> List[Dict[str, Any]]:
-    with _LOCK, _conn() as cx:
+def list_events(user_id: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+    """All events newest-first, or with start/end (ISO) only those overlapping
+    [start, end), ordered by start. Raises ValueError for an unparseable bound."""
+    if start or end:
+        return _events_in_window(user_id, start, end)
+    with _LOCKS.for_key(user_id), _conn() as cx:
+        rows = cx.execute(_SQL_LIST, (user_id,)).fetchall()
+        return [dict(r) for r in rows]
+
+def _events_in_window(user_id: str, start: Optional[str], end: Optional[str]) -> List[Dict[str, Any]]:
+    lo = bound_s(start, FAR_PAST)
+    hi = bound_s(end, FAR_FUTURE)
+    with _LOCKS.for_key(user_id), _conn() as cx:
+        span = cx.execute("SELECT max_span FROM event_spans WHERE user_id=?", (user_id,)).fetchone()
         rows = cx.execute(
-            "SELECT id, title, start, end, created_at FROM events WHERE user_id=? ORDER BY created_at DESC",
-            (user_id,)
+            _SQL_WINDOW,
+            (user_id, lo - (span["max_span"] if span else 0), hi, lo, lo)
         ).fetchall()
         return [dict(r) for r in rows]
 
 def history(user_id: str, limit: int = 50) -> Dict[str, Any]:
-    with _LOCK, _conn() as cx:
-        rows = cx.execute(
-            "SELECT id, ts, kind, payload FROM op_log WHERE user_id=? ORDER BY id DESC LIMIT ?",
-            (user_id, limit)
-        ).fetchall()
+    with _LOCKS.for_key(user_id), _conn() as cx:
+        rows = cx.execute(_SQL_HISTORY, (user_id, limit)).fetchall()
         items = []
         for r in rows:
             payload = None
@@ -63,45 +186,106 @@ def history(user_id: str, limit: int = 50) -> Dict[str, Any]:
             items.append({"id": r["id"], "ts": r["ts"], "kind": r["kind"], "payload": payload})
         return {"user_id": user_id, "limit": limit, "items": items, "total": len(items)}
 
-def apply_command(user_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+def _is_create(payload: Dict[str, Any]) -> bool:
+    return (payload.get("type") or "").lower() in {"create_event", "create"}
+
+def _new_event_row(user_id: str, payload: Dict[str, Any]) -> tuple:
+    """Row for _SQL_INSERT_EVENT built from a create payload."""
+    ts = _now_iso()
+    start = payload.get("start")
+    end = payload.get("end")
+    return (
+        str(uuid.uuid4()), user_id, payload.get("title") or "(untitled)", start, end,
+        ts, epoch_s(start), epoch_s(end), epoch_us(ts),
+    )
+
+def _create_diff(row: tuple) -> Dict[str, Any]:
+    ev_id, _, title, start, end, ts = row[:6]
+    return {"type": "create", "event": {"id": ev_id, "title": title, "start": start, "end": end, "created_at": ts}}
+
+def _op_row(user_id: str, kind: str, payload: Dict[str, Any]) -> tuple:
+    return (user_id, _now_iso(), kind, json.dumps(payload, ensure_ascii=False))
+
+def apply_command(user_id: str, payload: Dict[str, Any], include_events: bool = True) -> Dict[str, Any]:
+    """Apply one command; see store.apply_command for the response contract.
+
+    `version` is the id of this command's op_log row, which AUTOINCREMENT keeps
+    strictly increasing (never reused), so it is monotonic per user.
+    """
     kind = "noop"
+    version = None
     diff: Dict[str, Any] = {"type": "noop"}
-    with _LOCK, _conn() as cx:
+    with _LOCKS.for_key(user_id), _conn() as cx:
         if payload.get("op") == "noop":
             kind = "noop"
         elif payload.get("op") == "delete_last":
-            row = cx.execute(
-                "SELECT id FROM events WHERE user_id=? ORDER BY created_at DESC LIMIT 1",
-                (user_id,)
-            ).fetchone()
+            row = cx.execute(_SQL_LAST_ID, (user_id,)).fetchone()
             if row:
                 ev_id = row["id"]
                 cx.execute("DELETE FROM events WHERE id=? AND user_id=?", (ev_id, user_id))
                 diff = {"type": "delete", "id": ev_id}
                 kind = "delete_last"
-        elif (payload.get("type") or "").lower() in {"create_event", "create"}:
-            ev_id = str(uuid.uuid4())
-            title = payload.get("title") or "(untitled)"
-            start = payload.get("start")
-            end = payload.get("end")
-            ts = _now_iso()
-            cx.execute(
-                "INSERT INTO events (id, user_id, title, start, end, created_at) VALUES (?,?,?,?,?,?)",
-                (ev_id, user_id, title, start, end, ts)
-            )
-            diff = {"type": "create", "event": {"id": ev_id, "title": title, "start": start, "end": end, "created_at": ts}}
+        elif _is_create(payload):
+            ev = _new_event_row(user_id, payload)
+            cx.execute(_SQL_INSERT_EVENT, ev)
+            cx.execute(_SQL_UPSERT_SPAN, (user_id, _span_s(ev[6], ev[7])))
+            diff = _create_diff(ev)
             kind = "create"
         else:
             kind = "noop"
 
         try:
-            cx.execute(
-                "INSERT INTO op_log (user_id, ts, kind, payload) VALUES (?,?,?,?)",
-                (user_id, _now_iso(), kind, json.dumps(payload, ensure_ascii=False))
-            )
+            version = cx.execute(_SQL_INSERT_OP, _op_row(user_id, kind, payload)).lastrowid
         except Exception:
             pass
 
         cx.commit()
 
-    return {"status": "ok", "diff": diff, "events": list_events(user_id)}
+    result: Dict[str, Any] = {"status": "ok", "diff": diff, "version": version}
+    if include_events:
+        result["events"] = list_events(user_id)
+    return result
+
+def apply_batch(user_id: str, payloads: List[Dict[str, Any]], include_events: bool = True) -> Dict[str, Any]:
+    """Apply several commands in one lock acquisition and one transaction.
+
+    Creates and op-log rows are buffered and written with executemany; a
+    delete_last that follows a buffered create cancels it without touching the
+    database. Any failure rolls the whole batch back. The diff is
+    {"type": "batch", "count", "diffs"} with one entry per command, in order.
+    """
+    diffs: List[Dict[str, Any]] = []
+    new_events: List[tuple] = []
+    op_rows: List[tuple] = []
+    with _LOCKS.for_key(user_id), _conn() as cx:
+        for payload in payloads:
+            kind, diff = "noop", {"type": "noop"}
+            if payload.get("op") == "delete_last":
+                if new_events:
+                    diff, kind = {"type": "delete", "id": new_events.pop()[0]}, "delete_last"
+                else:
+                    row = cx.execute(_SQL_LAST_ID, (user_id,)).fetchone()
+                    if row:
+                        cx.execute("DELETE FROM events WHERE id=? AND user_id=?", (row["id"], user_id))
+                        diff, kind = {"type": "delete", "id": row["id"]}, "delete_last"
+            elif _is_create(payload):
+                ev = _new_event_row(user_id, payload)
+                new_events.append(ev)
+                diff, kind = _create_diff(ev), "create"
+            diffs.append(diff)
+            op_rows.append(_op_row(user_id, kind, payload))
+
+        cx.executemany(_SQL_INSERT_EVENT, new_events)
+        if new_events:
+            cx.execute(_SQL_UPSERT_SPAN, (user_id, max(_span_s(ev[6], ev[7]) for ev in new_events)))
+        cx.executemany(_SQL_INSERT_OP, op_rows)
+        version = cx.execute(_SQL_LAST_OP_ID, (user_id,)).fetchone()[0]
+
+    result: Dict[str, Any] = {
+        "status": "ok",
+        "diff": {"type": "batch", "count": len(diffs), "diffs": diffs},
+        "version": version,
+    }
+    if include_events:
+        result["events"] = list_events(user_id)
+    return result
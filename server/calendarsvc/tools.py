@@ -52,12 +52,17 @@ def _build_event_from_params(params: Dict[str, Any]) -> Dict[str, Any]:
 
 
 # ----- Public surface expected by routes --------------------------------------
-def list_events(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+def list_events(
+    user_id: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> List[Dict[str, Any]]:
     """
     Return a list of events. If user_id is None, return a flattened list
     across all users. (Route code may call without user context.)
+    With user_id and an ISO start/end, only events overlapping [start, end).
     """
-    return provider.list(user_id=user_id)
+    return provider.list(user_id=user_id, start=start, end=end)
 
 
 def apply(cmd: Command) -> Dict[str, Any]:
@@ -4,6 +4,19 @@ from typing import List, Optional
 class Settings(BaseSettings):
     cors_origins: List[str] = ["http://localhost:3000"]
     database_url: str = "sqlite:///./calendar.db"
+    # Bounded thread pool that runs blocking DB calls for the async routes
+    db_max_workers: int = 8
+    # Per-socket outbound queue depth and what to do when it fills ("drop" | "disconnect")
+    ws_send_queue: int = 256
+    ws_slow_consumer: str = "disconnect"
+    # Cross-worker broadcast: "inprocess" (single worker) or "unix" (datagram
+    # sockets in ws_backplane_dir shared by every worker on the host)
+    ws_backplane: str = "inprocess"
+    ws_backplane_dir: str = "/tmp/calendar-ws"
+    # Changes kept per user for /ws?since= resume; older cursors get a full snapshot
+    ws_change_window: int = 1000
+    # Merge a room's broadcasts within this many ms into one batch frame (0 = off)
+    ws_coalesce_ms: int = 0
     # LLM (optional)
     llm_provider: Optional[str] = None   # e.g., "openai"
     openai_api_key: Optional[str] = None
@@ -1,9 +1,13 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from datetime import datetime
 import uuid
 
 class Event(SQLModel, table=True):
+    # Serves per-user time-window lookups (start_at is ISO, so it sorts lexically)
+    __table_args__ = (Index("ix_event_user_start", "user_id", "start_at"),)
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     user_id: str = Field(index=True)
     title: str
@@ -12,3 +16,10 @@ class Event(SQLModel, table=True):
     all_day: bool = False
     created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     updated_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+
+class EventChange(SQLModel, table=True):
+    # Per-user change log behind /ws?since=<version>; only the latest
+    # ws_change_window versions per user are kept.
+    user_id: str = Field(primary_key=True)
+    version: int = Field(primary_key=True)
+    message: str   # JSON of the broadcast message, without its version
@@ -1,11 +1,77 @@
+from sqlalchemy import text
 from sqlmodel import SQLModel, create_engine, Session
 from core.config import settings
+from db.models import Event
 from contextlib import contextmanager
 
-engine = create_engine(settings.database_url, echo=False)
+# Sessions are opened from the async routes' DB executor threads, so SQLite
+# connections must be usable from whichever pool thread checks them out.
+_connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+engine = create_engine(settings.database_url, echo=False, connect_args=_connect_args)
+
+# Standalone FTS5 index over event.title, keyed by event id. event has a TEXT
+# primary key, so its implicit rowids are not stable (VACUUM may renumber them)
+# and must not be what the index points at. Instead TITLE_KEYS hands out stable
+# integer keys per event id and the FTS row with that rowid holds the title.
+# The trigram tokenizer answers
+# case-insensitive substring queries (the old ILIKE '%x%') from the index;
+# triggers keep both tables in step with the event table.
+TITLE_FTS = "event_title_fts"
+TITLE_KEYS = "event_title_key"
+_TITLE_KEY = f"(SELECT fts_rowid FROM {TITLE_KEYS} WHERE event_id = old.id)"
+_TITLE_FTS_DDL = [
+    f"CREATE TABLE {TITLE_KEYS} (fts_rowid INTEGER PRIMARY KEY, event_id TEXT NOT NULL UNIQUE)",
+    f"CREATE VIRTUAL TABLE {TITLE_FTS} USING fts5(title, tokenize='trigram')",
+    f"INSERT INTO {TITLE_KEYS}(event_id) SELECT id FROM event",
+    f"""INSERT INTO {TITLE_FTS}(rowid, title)
+        SELECT k.fts_rowid, e.title FROM {TITLE_KEYS} k JOIN event e ON e.id = k.event_id""",
+    f"""CREATE TRIGGER event_title_fts_ai AFTER INSERT ON event BEGIN
+        INSERT INTO {TITLE_KEYS}(event_id) VALUES (new.id);
+        INSERT INTO {TITLE_FTS}(rowid, title) VALUES (last_insert_rowid(), new.title);
+    END""",
+    f"""CREATE TRIGGER event_title_fts_ad AFTER DELETE ON event BEGIN
+        DELETE FROM {TITLE_FTS} WHERE rowid = {_TITLE_KEY};
+        DELETE FROM {TITLE_KEYS} WHERE event_id = old.id;
+    END""",
+    f"""CREATE TRIGGER event_title_fts_au AFTER UPDATE OF title ON event BEGIN
+        UPDATE {TITLE_FTS} SET title = new.title WHERE rowid = {_TITLE_KEY};
+    END""",
+]
+# The first layout was an external-content index on event's implicit rowid
+_TITLE_FTS_OLD = [
+    "DROP TRIGGER IF EXISTS event_title_fts_ai",
+    "DROP TRIGGER IF EXISTS event_title_fts_ad",
+    "DROP TRIGGER IF EXISTS event_title_fts_au",
+    f"DROP TABLE IF EXISTS {TITLE_FTS}",
+]
+_title_fts = False
+
+def _ensure_title_fts() -> bool:
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.begin() as cx:
+            exists = cx.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"), {"n": TITLE_KEYS}
+            ).first()
+            if not exists:
+                for stmt in _TITLE_FTS_OLD + _TITLE_FTS_DDL:
+                    cx.execute(text(stmt))
+        return True
+    except Exception:
+        # SQLite built without FTS5/trigram (< 3.34): title search falls back to ILIKE
+        return False
+
+def title_fts_enabled() -> bool:
+    return _title_fts
 
 def init_db():
+    global _title_fts
     SQLModel.metadata.create_all(engine)
+    # create_all skips indexes on tables that already exist
+    for ix in Event.__table__.indexes:
+        ix.create(engine, checkfirst=True)
+    _title_fts = _ensure_title_fts()
 
 @contextmanager
 def get_session():
@@ -1,41 +1,83 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
 import uuid
 
+from server.calendarsvc.instants import FAR_FUTURE, FAR_PAST, bound_s, epoch_s, overlaps
+
 
 class MemoryProvider:
     """
     Minimal in-memory event store used by calendarsvc.tools and routes.
     Structure:
       USER_DB[user_id][event_id] = event_dict
+      _BY_START[user_id] = sorted [(start_epoch_s, event_id)]  (interval index)
+      _MAX_SPAN[user_id] = upper bound on any event's (end - start) in seconds
     """
 
     def __init__(self) -> None:
         self.USER_DB: Dict[str, Dict[str, dict]] = {}
+        self._BY_START: Dict[str, List[Tuple[int, str]]] = {}
+        self._MAX_SPAN: Dict[str, int] = {}
 
     # internal
     def _bucket(self, user_id: str) -> Dict[str, dict]:
         return self.USER_DB.setdefault(user_id, {})
 
+    def _index_add(self, user_id: str, event: dict) -> None:
+        start_s = epoch_s(event.get("start"))
+        if start_s is None:
+            return
+        insort(self._BY_START.setdefault(user_id, []), (start_s, event["id"]))
+        end_s = epoch_s(event.get("end"))
+        if end_s is not None:
+            span = max(0, end_s - start_s)
+            self._MAX_SPAN[user_id] = max(self._MAX_SPAN.get(user_id, 0), span)
+
+    def _index_remove(self, user_id: str, event: dict) -> None:
+        start_s = epoch_s(event.get("start"))
+        keys = self._BY_START.get(user_id)
+        if start_s is None or not keys:
+            return
+        i = bisect_left(keys, (start_s, event["id"]))
+        if i < len(keys) and keys[i] == (start_s, event["id"]):
+            del keys[i]
+
     # CRUD surface (simple and predictable)
     def create(self, user_id: str, event: dict) -> dict:
         eid = event.get("id") or str(uuid.uuid4())
         stored = {**event, "id": eid}
-        self._bucket(user_id)[eid] = stored
+        bucket = self._bucket(user_id)
+        if eid in bucket:
+            self._index_remove(user_id, bucket[eid])
+        bucket[eid] = stored
+        self._index_add(user_id, stored)
         return stored
 
     def update(self, user_id: str, event_id: str, patch: dict) -> dict:
         bucket = self._bucket(user_id)
         if event_id not in bucket:
             raise KeyError(f"event not found: {event_id}")
+        self._index_remove(user_id, bucket[event_id])
         bucket[event_id].update(patch)
+        self._index_add(user_id, bucket[event_id])
         return bucket[event_id]
 
     def delete(self, user_id: str, event_id: str) -> bool:
-        return self._bucket(user_id).pop(event_id, None) is not None
+        removed = self._bucket(user_id).pop(event_id, None)
+        if removed is not None:
+            self._index_remove(user_id, removed)
+        return removed is not None
 
-    def list(self, user_id: Optional[str] = None) -> List[dict]:
+    def list(
+        self,
+        user_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[dict]:
+        if user_id and (start or end):
+            return self._list_window(user_id, start, end)
         if user_id:
             return list(self._bucket(user_id).values())
         # Flatten all users (used by some legacy list paths)
@@ -44,10 +86,26 @@ class MemoryProvider:
             out.extend(m.values())
         return out
 
+    def _list_window(self, user_id: str, start: Optional[str], end: Optional[str]) -> List[dict]:
+        """Events overlapping [start, end), ordered by start, in O(log n + k)."""
+        lo = bound_s(start, FAR_PAST)
+        hi = bound_s(end, FAR_FUTURE)
+        keys = self._BY_START.get(user_id, [])
+        bucket = self._bucket(user_id)
+        out: List[dict] = []
+        i = bisect_left(keys, (lo - self._MAX_SPAN.get(user_id, 0), ""))
+        while i < len(keys) and keys[i][0] < hi:
+            start_s, eid = keys[i]
+            ev = bucket[eid]
+            if overlaps(start_s, epoch_s(ev.get("end")), lo):
+                out.append(ev)
+            i += 1
+        return out
+
 
 # Canonical instance expected by calendarsvc.tools and others
 provider = MemoryProvider()
 
 # Legacy export some code relies on
 USER_DB = provider.USER_DB
- 
\ No newline at end of file
+ 
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
-from services.events import EventsService
-from typing import Dict, List
+from fastapi.responses import JSONResponse
+from services.events import AsyncEventsService
 from sqlmodel import SQLModel
 from utils.connections import manager
 from auth.deps import get_current_user
 
 router = APIRouter(prefix="/api/events", tags=["events"])
-svc = EventsService()
+# Every committed change (with its version) is pushed to the user's sockets
+svc = AsyncEventsService(on_change=manager.broadcast_room)
 
 class EventCreate(SQLModel):
     title: str
@@ -15,21 +16,19 @@ class EventCreate(SQLModel):
     all_day: bool = False
 
 @router.get("")
-async def list_events(user=Depends(get_current_user)) -> Dict[str, List[dict]]:
+async def list_events(user=Depends(get_current_user)):
     uid = user["user_id"]
-    return {"events": [e.dict() for e in svc.list(uid)]}
+    # Rows are already JSON-native; skip response-model validation and jsonable_encoder
+    return JSONResponse({"events": await svc.list_rows(uid)})
 
 @router.post("")
 async def create_event(payload: EventCreate, user=Depends(get_current_user)):
     uid = user["user_id"]
-    ev = svc.create(uid, payload.title, payload.start_at, payload.end_at, payload.all_day)
-    await manager.broadcast_room(uid, {"type":"event_created","event": ev.dict()})
+    ev = await svc.create(uid, payload.title, payload.start_at, payload.end_at, payload.all_day)
     return {"event": ev.dict()}
 
 @router.delete("/{event_id}")
 async def delete_event(event_id: str, user=Depends(get_current_user)):
     uid = user["user_id"]
-    ok = svc.delete_by_id(uid, event_id)
-    if ok:
-        await manager.broadcast_room(uid, {"type":"event_deleted","event_id": event_id})
+    ok = await svc.delete_by_id(uid, event_id)
     return {"success": ok}
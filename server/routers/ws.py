@@ -1,9 +1,29 @@
+import asyncio
+from typing import Optional, Set
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from auth.supabase import verify_supabase_token
 from utils.connections import manager
-from services.events import EventsService
+from services import commands
+from services.events import AsyncEventsService
 
 router = APIRouter(tags=["ws"])
+svc = AsyncEventsService(on_change=manager.broadcast_room)
+# Commands a single socket may have in flight before we stop reading from it
+_MAX_INFLIGHT = 8
+
+async def _sync(user_id: str, ws: WebSocket, since: Optional[str]):
+    # Resume from the client's last seen version when the change log still
+    # covers the gap; otherwise send a full snapshot. The socket joined the room
+    # paused, so broadcasts committed meanwhile are held and only those newer
+    # than this message follow it. Clients ignore any message whose version is
+    # not above their cursor.
+    changes = await svc.changes_since(user_id, int(since)) if since and since.isdigit() else None
+    if changes is not None:
+        version = changes[-1]["version"] if changes else int(since)
+        manager.resume(user_id, ws, {"type":"changes", "version": version, "changes": changes})
+        return
+    version, rows = await svc.snapshot(user_id)
+    manager.resume(user_id, ws, {"type":"initial_events", "version": version, "events": rows})
 
 @router.websocket("/ws")
 async def events_ws(ws: WebSocket):
@@ -18,11 +38,28 @@ async def events_ws(ws: WebSocket):
         return
 
     user_id = claims.get("sub") or "anon"
-    await manager.connect(user_id, ws)
-    svc = EventsService()
-    await ws.send_json({"type":"initial_events", "events": [e.dict() for e in svc.list(user_id)]})
+    await manager.connect(user_id, ws, paused=True)
+    inflight = asyncio.Semaphore(_MAX_INFLIGHT)
+    tasks: Set[asyncio.Task] = set()
     try:
+        await _sync(user_id, ws, ws.query_params.get("since"))
         while True:
-            await ws.receive_text()
+            frame = await ws.receive_text()
+            await inflight.acquire()
+            # Requests run concurrently (a slow interpret must not hold up a
+            # mutate); replies are correlated by request id, not order.
+            task = asyncio.create_task(_serve(user_id, ws, frame, inflight))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
     except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
         manager.disconnect(user_id, ws)
+
+async def _serve(user_id: str, ws: WebSocket, frame: str, inflight: asyncio.Semaphore):
+    try:
+        await manager.send(user_id, ws, await commands.handle(user_id, frame, svc))
+    finally:
+        inflight.release()
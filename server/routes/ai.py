@@ -1,101 +1,117 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from server.ai import pipeline
+from server.ai.pipeline import InterpretError
+from server.ai.stream import FieldStream
 from server.auth import get_current_user, AuthUser
+from server.calendarsvc import store
+from server.routes.calendar import _wants_delta
 
-# OpenAI client (expects OPENAI_API_KEY in env; already used elsewhere in this repo)
-try:
-    from openai import OpenAI
-    _openai_client = OpenAI()
-except Exception as e:
-    _openai_client = None
+log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
-SYSTEM_PROMPT = """You are a calendar command generator.
-Return ONLY a JSON object that matches one of these shapes:
-
-1) Create:
-{
-  "type": "create_event",
-  "title": "<short title>",
-  "start": "<ISO8601 with timezone, e.g. 2025-10-16T09:30:00-07:00>",
-  "end":   "<ISO8601 with timezone>"
-}
-
-2) Delete last:
-{ "op": "delete_last" }
-
-Rules:
-- If the user says "delete last", use the delete shape.
-- Otherwise assume create.
-- Use the user's timezone and current date context provided to you.
-- Never return null for start or end. If duration is spoken (e.g., "for 30 minutes"), compute end; otherwise default duration = 30 minutes.
-- If no title is provided, use "untitled".
-- Do NOT include extra top-level properties. Do NOT wrap the object in another key.
-"""
-
-def _llm_interpret(text: str, tz: str, now_iso: str) -> Dict[str, Any]:
-    if _openai_client is None:
-        raise HTTPException(status_code=500, detail="LLM client not available on server")
-
-    user_context = f"""User timezone: {tz}
-Current datetime (ISO): {now_iso}
-User said: {text}"""
+def _text_tz(body: Dict[str, Any]) -> Tuple[str, str]:
+    text = (body.get("text") or "").strip()
+    tz = (body.get("tz") or "America/Los_Angeles").strip() or "America/Los_Angeles"
+    if not text:
+        raise HTTPException(status_code=400, detail="Missing text")
+    return text, tz
 
-    resp = _openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0,
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_context},
-        ],
-    )
-    raw = resp.choices[0].message.content or "{}"
+async def _interpret(text: str, tz: str, user_id: str) -> Dict[str, Any]:
     try:
-        cmd = json.loads(raw)
-        if not isinstance(cmd, dict):
-            raise ValueError("not an object")
-    except Exception:
-        raise HTTPException(status_code=422, detail="Interpreter returned non-JSON")
-
-    # Validate minimal fields and normalize to backend contract
-    if cmd.get("op") == "delete_last":
-        return {"op": "delete_last"}
-
-    # create_event defaulting
-    if cmd.get("type") != "create_event":
-        cmd["type"] = "create_event"
-    cmd.setdefault("title", "untitled")
-
-    # ensure start/end are present and ISO strings
-    if not cmd.get("start") or not cmd.get("end"):
-        raise HTTPException(status_code=422, detail="Interpreter missing start/end")
-    if not isinstance(cmd["start"], str) or not isinstance(cmd["end"], str):
-        raise HTTPException(status_code=422, detail="Interpreter produced invalid datetimes")
-
-    return cmd
+        return await pipeline.interpret(text, tz, user_id)
+    except InterpretError as e:
+        raise HTTPException(status_code=e.status, detail=e.detail)
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _interpret_events(text: str, tz: str, user: AuthUser) -> AsyncIterator[str]:
+    now = time.time()
+    cmd = pipeline.quick_interpret(text, tz, now)
+    if cmd is None:
+        fields = FieldStream()
+        raw: List[str] = []
+        try:
+            async for delta in pipeline.llm_stream(text, tz):
+                raw.append(delta)
+                if fields.feed(delta):
+                    yield _sse("partial", {"fields": fields.fields})
+            cmd = pipeline.parse_command("".join(raw))
+        except InterpretError as e:
+            yield _sse("error", {"status": e.status, "detail": e.detail})
+            return
+        except Exception as e:
+            # Headers are already sent: report provider failures (timeouts,
+            # connection and rate-limit errors) in-band instead of killing the stream
+            log.warning("interpret stream failed: %s: %s", type(e).__name__, e)
+            yield _sse("error", {"status": 502, "detail": f"Interpreter failed: {type(e).__name__}"})
+            return
+        pipeline.remember(text, tz, cmd, now)
+    yield _sse("command", {"command": cmd, "user": {"sub": user.sub, "email": user.email}})
 
 @router.post("/interpret")
-def interpret(body: Dict[str, Any], user: AuthUser = Depends(get_current_user)) -> Dict[str, Any]:
+async def interpret(body: Dict[str, Any], user: AuthUser = Depends(get_current_user)) -> Dict[str, Any]:
     """
     Body accepted from the frontend: { "text": str, "tz": str }
     Returns { "command": <create_event|delete_last>, "user": {...} }
     """
-    text = (body.get("text") or "").strip()
-    tz = (body.get("tz") or "America/Los_Angeles").strip() or "America/Los_Angeles"
-    if not text:
-        raise HTTPException(status_code=400, detail="Missing text")
+    text, tz = _text_tz(body)
+    cmd = await _interpret(text, tz, user.sub)
+    return {
+        "command": cmd,
+        "user": {"sub": user.sub, "email": user.email},
+    }
 
-    # Use server-side current timestamp (ISO) just for grounding
-    from datetime import datetime
-    now_iso = datetime.now().astimezone().isoformat()
+@router.post("/interpret/stream")
+async def interpret_stream(body: Dict[str, Any], user: AuthUser = Depends(get_current_user)) -> StreamingResponse:
+    """
+    Streaming /ai/interpret over SSE. Body as /ai/interpret.
+    Emits "partial" events ({"fields": {...}}, cumulative) as top-level command
+    fields complete, then one "command" event with the /ai/interpret payload,
+    or an "error" event ({"status", "detail"}).
+    """
+    text, tz = _text_tz(body)
+    return StreamingResponse(
+        _interpret_events(text, tz, user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    cmd = _llm_interpret(text=text, tz=tz, now_iso=now_iso)
+@router.post("/execute")
+async def execute(
+    body: Dict[str, Any],
+    user: AuthUser = Depends(get_current_user),
+    delta: bool = Query(default=False, description="Return only diff + version, no events array"),
+    prefer: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """
+    Interpret and apply in one round trip. Body as /ai/interpret.
+    Returns { "command", "applied", "result", "user" } where result is the
+    /calendar/mutate response for the command.
+    """
+    text, tz = _text_tz(body)
+    cmd = await _interpret(text, tz, user.sub)
+    # The store may hit SQLite; keep it off the event loop
+    result = await run_in_threadpool(
+        store.apply_command, user.sub, cmd, include_events=not _wants_delta(delta, prefer)
+    )
     return {
         "command": cmd,
+        "applied": result.get("status") == "ok",
+        "result": result,
         "user": {"sub": user.sub, "email": user.email},
     }
+
+@router.get("/cache/stats")
+def cache_stats(user: AuthUser = Depends(get_current_user)) -> Dict[str, Any]:
+    # Interpretation cache metrics plus single-flight counters; see pipeline.stats
+    return pipeline.stats()
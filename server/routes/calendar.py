@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Any, Dict, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
 from server.auth import get_current_user, AuthUser
 from server.calendarsvc import store
@@ -8,8 +8,17 @@ from server.calendarsvc import store
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
 @router.get("/list")
-def list_events(user: AuthUser = Depends(get_current_user)) -> Any:
-    # Legacy: raw array of events
+def list_events(
+    user: AuthUser = Depends(get_current_user),
+    start: Optional[str] = Query(default=None, description="ISO start of window (inclusive)"),
+    end: Optional[str] = Query(default=None, description="ISO end of window (exclusive)"),
+) -> Any:
+    # Legacy: raw array of events. With start/end, only events overlapping the window.
+    if start or end:
+        try:
+            return store.list_events(user.sub, start=start, end=end)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     return store.list_events(user.sub)
 
 @router.get("/history")
@@ -20,7 +29,35 @@ def get_history(
     # Legacy: { user_id, limit, items, total } with items newest-first
     return store.history(user.sub, limit=limit or 50)
 
+def _wants_delta(delta: bool, prefer: Optional[str]) -> bool:
+    # Opt-in via ?delta=true or the standard "Prefer: return=minimal" header.
+    return delta or "return=minimal" in (prefer or "").replace(" ", "").lower()
+
 @router.post("/mutate")
-def mutate(payload: Dict[str, Any], user: AuthUser = Depends(get_current_user)) -> Dict[str, Any]:
-    # Legacy: {"status":"ok"|"error", "diff": {...}, "events":[...]}
-    return store.apply_command(user.sub, payload)
+def mutate(
+    payload: Dict[str, Any],
+    user: AuthUser = Depends(get_current_user),
+    delta: bool = Query(default=False, description="Return only diff + version, no events array"),
+    prefer: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    # Legacy: {"status":"ok"|"error", "diff": {...}, "version": n, "events":[...]}
+    # Delta mode: same without "events"; clients apply the diff and track version.
+    return store.apply_command(user.sub, payload, include_events=not _wants_delta(delta, prefer))
+
+_BATCH_MAX = 500
+
+@router.post("/mutate/batch")
+def mutate_batch(
+    body: Dict[str, Any],
+    user: AuthUser = Depends(get_current_user),
+    delta: bool = Query(default=False, description="Return only diff + version, no events array"),
+    prefer: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    # Body: {"commands": [<mutate payload>, ...]}, applied atomically in order.
+    # Returns the /mutate shape with diff = {"type":"batch", "count", "diffs":[...]}.
+    commands = body.get("commands")
+    if not isinstance(commands, list) or not all(isinstance(c, dict) for c in commands):
+        raise HTTPException(status_code=400, detail="commands must be a list of objects")
+    if len(commands) > _BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"too many commands (max {_BATCH_MAX})")
+    return store.apply_batch(user.sub, commands, include_events=not _wants_delta(delta, prefer))
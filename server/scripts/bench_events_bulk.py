@@ -0,0 +1,69 @@
+"""Bulk create/delete in EventsService vs the per-row ORM loops they replace.
+
+Times N single-row creates against one create_many, and the old
+get-then-delete loop against the chunked set-based delete_many.
+
+Run from the server/ directory (the routers stack uses bare imports):
+
+    cd server && python -m scripts.bench_events_bulk
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from db.models import Event  # noqa: E402
+from db.session import get_session, init_db  # noqa: E402
+from services.events import EventsService  # noqa: E402
+
+N = 500
+
+
+def _orm_delete_loop(user_id: str, ids: List[str]) -> int:
+    # The previous delete_many implementation
+    count = 0
+    with get_session() as s:
+        for id_ in ids:
+            ev = s.get(Event, id_)
+            if ev and ev.user_id == user_id:
+                s.delete(ev)
+                count += 1
+        s.commit()
+    return count
+
+
+def _items() -> List[dict]:
+    return [{"title": f"ev {i}", "start_at": "2025-10-13T09:00:00", "end_at": "2025-10-13T10:00:00"} for i in range(N)]
+
+
+def main() -> None:
+    init_db()
+    svc = EventsService()
+
+    t0 = time.perf_counter()
+    loop_evs = [svc.create("bench-a", it["title"], it["start_at"], it["end_at"]) for it in _items()]
+    t_create_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bulk_evs = svc.create_many("bench-b", _items())
+    t_create_bulk = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    n_loop = _orm_delete_loop("bench-a", [e.id for e in loop_evs])
+    t_delete_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    n_bulk = len(svc.delete_many("bench-b", [e.id for e in bulk_evs]))
+    t_delete_bulk = time.perf_counter() - t0
+
+    assert n_loop == n_bulk == N
+    print(f"create  x{N}: per-row {t_create_loop * 1000:8.1f}ms   create_many {t_create_bulk * 1000:7.1f}ms")
+    print(f"delete  x{N}: orm loop {t_delete_loop * 1000:7.1f}ms   delete_many {t_delete_bulk * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
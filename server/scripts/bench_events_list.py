@@ -0,0 +1,55 @@
+"""Initial-load cost: ORM hydration + .dict() vs the list_rows projection.
+
+Seeds one user with N events and times building the JSON body for
+GET /api/events and the /ws initial_events message both ways.
+
+Run from the server/ directory (the routers stack uses bare imports):
+
+    cd server && python -m scripts.bench_events_list
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from db.session import init_db  # noqa: E402
+from services.events import EventsService  # noqa: E402
+
+N = 20_000
+REPEAT = 5
+
+
+def _time(fn) -> tuple:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    per = (time.perf_counter() - t0) / REPEAT * 1000.0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per, peak / 1e6
+
+
+def main() -> None:
+    init_db()
+    svc = EventsService()
+    uid = "bench-list"
+    svc.create_many(uid, [{"title": f"ev {i}", "start_at": "2025-10-13T09:00:00", "end_at": "2025-10-13T10:00:00"}
+                          for i in range(N)])
+
+    orm = _time(lambda: json.dumps({"type": "initial_events", "events": [e.model_dump() for e in svc.list(uid)]}))
+    rows = _time(lambda: json.dumps({"type": "initial_events", "events": svc.list_rows(uid)}))
+    print(f"events={N}")
+    print(f"orm + dump : {orm[0]:8.1f}ms  peak {orm[1]:6.1f}MB")
+    print(f"list_rows  : {rows[0]:8.1f}ms  peak {rows[1]:6.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
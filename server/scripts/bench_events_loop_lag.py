@@ -0,0 +1,76 @@
+"""Event-loop lag while /api/events writes are hammered.
+
+A ticker coroutine stands in for WebSocket traffic: it sleeps 1 ms in a loop
+and records how late it wakes up. Meanwhile N concurrent writers create events
+either inline on the loop (the old blocking path) or through
+AsyncEventsService (the bounded DB executor). Flat ticker latency in the
+second run is what keeps /ws pushes responsive under REST load.
+
+Run from the server/ directory (the routers stack uses bare imports):
+
+    cd server && python -m scripts.bench_events_loop_lag
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from db.session import init_db  # noqa: E402
+from services.events import AsyncEventsService, EventsService  # noqa: E402
+
+WRITERS = 32
+WRITES_PER_WRITER = 50
+TICK_S = 0.001
+
+
+async def _ticker(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(TICK_S)
+        lags.append((time.perf_counter() - t0 - TICK_S) * 1000.0)
+
+
+async def _run(mode: str) -> None:
+    sync = EventsService()
+    asvc = AsyncEventsService(sync)
+
+    async def writer(w: int) -> None:
+        for i in range(WRITES_PER_WRITER):
+            uid = f"bench-{w % 4}"
+            if mode == "blocking":
+                sync.create(uid, f"ev {i}", "2025-10-13T09:00:00Z", "2025-10-13T10:00:00Z")
+                await asyncio.sleep(0)
+            else:
+                await asvc.create(uid, f"ev {i}", "2025-10-13T09:00:00Z", "2025-10-13T10:00:00Z")
+
+    stop = asyncio.Event()
+    lags: list = []
+    tick = asyncio.create_task(_ticker(stop, lags))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(WRITERS)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await tick
+
+    lags.sort()
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0
+    print(
+        f"{mode:9s} writes={WRITERS * WRITES_PER_WRITER} in {elapsed:.2f}s  "
+        f"ticks={len(lags)}  lag p50={statistics.median(lags) if lags else 0:.2f}ms "
+        f"p99={p99:.2f}ms max={lags[-1] if lags else 0:.2f}ms"
+    )
+
+
+def main() -> None:
+    init_db()
+    for mode in ("blocking", "executor"):
+        asyncio.run(_run(mode))
+
+
+if __name__ == "__main__":
+    main()
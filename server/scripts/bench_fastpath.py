@@ -0,0 +1,50 @@
+"""Coverage, accuracy and latency of the rule-based interpret fast path.
+
+Runs ai.nlp.fast_parse over the labelled corpus in
+server/tests/data/fastpath_corpus.jsonl. An entry whose expect is null should
+be escalated to the LLM.
+
+- coverage: share of simple commands answered locally
+- accuracy: share of local answers that match the label
+- escalated: utterances handed to the LLM
+
+Run from the repo root:
+
+    python -m server.scripts.bench_fastpath
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import datetime
+
+from server.ai.nlp import fast_parse
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "tests", "data", "fastpath_corpus.jsonl")
+REPEAT = 200
+
+
+def main() -> None:
+    with open(CORPUS) as f:
+        items = [json.loads(line) for line in f if line.strip()]
+    answered = correct = 0
+    for it in items:
+        got = fast_parse(it["text"], it["tz"], datetime.fromisoformat(it["now"]))
+        if got.command is not None:
+            answered += 1
+            correct += got.command == it["expect"]
+    simple = sum(1 for it in items if it["expect"] is not None)
+
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        for it in items:
+            fast_parse(it["text"], it["tz"], datetime.fromisoformat(it["now"]))
+    per_us = (time.perf_counter() - t0) / (REPEAT * len(items)) * 1e6
+
+    print(f"corpus={len(items)} simple={simple} answered={answered} escalated={len(items) - answered}")
+    print(f"coverage={answered / simple:.1%} accuracy={correct / max(answered, 1):.1%} latency={per_us:.1f}us/utterance")
+
+
+if __name__ == "__main__":
+    main()
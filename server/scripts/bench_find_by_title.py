@@ -0,0 +1,55 @@
+"""Latency of EventsService.find_by_title_window on a 100k-event calendar.
+
+Seeds one user with N events in bulk and times the "delete my dentist
+appointment next week" lookup: a title substring plus a one-week window.
+
+Run from the server/ directory (the routers stack uses bare imports):
+
+    cd server && python -m scripts.bench_find_by_title
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from db.models import Event  # noqa: E402
+from db.session import get_session, init_db  # noqa: E402
+from services.events import EventsService  # noqa: E402
+
+N = 100_000
+REPEAT = 50
+TITLES = ["Team standup", "Lunch with Sam", "Gym", "Dentist appointment", "1:1 review", "Flight to NYC"]
+
+
+def _seed(uid: str) -> None:
+    base = datetime(2025, 1, 1)
+    rows = []
+    for i in range(N):
+        start = (base + timedelta(hours=i)).isoformat()
+        rows.append({"user_id": uid, "title": f"{TITLES[i % len(TITLES)]} #{i}", "start_at": start,
+                     "end_at": start, "created_at": start, "updated_at": start})
+    with get_session() as s:
+        s.bulk_insert_mappings(Event, rows)
+        s.commit()
+
+
+def main() -> None:
+    init_db()
+    uid = "bench-find"
+    _seed(uid)
+    svc = EventsService()
+    lo, hi = "2028-03-01T00:00:00", "2028-03-08T00:00:00"
+    hits = svc.find_by_title_window(uid, "dentist", lo, hi)
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        svc.find_by_title_window(uid, "dentist", lo, hi)
+    per = (time.perf_counter() - t0) / REPEAT * 1000.0
+    print(f"events={N} hits={len(hits)} find_by_title_window={per:.2f}ms/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Throughput of 200 concurrent utterances against a local stub LLM server.
+
+Starts an OpenAI-compatible stub (/v1/chat/completions, fixed think time) on
+localhost and compares two ways of calling it:
+
+- per-call: a fresh AsyncOpenAI client per utterance, which is what the
+  orchestrator used to do (new pool, new connections every time)
+- shared: server.ai.client.chat_json, which uses one pooled client with a
+  concurrency cap
+
+Run from the repo root:
+
+    python -m server.scripts.bench_llm_client
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+from openai import AsyncOpenAI
+
+UTTERANCES = 200
+THINK_S = 0.05
+
+_stub = FastAPI()
+
+
+@_stub.post("/v1/chat/completions")
+async def _completions(body: dict):
+    await asyncio.sleep(THINK_S)
+    content = json.dumps({"op": "delete_last"})
+    return {
+        "id": "stub", "object": "chat.completion", "created": 0, "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+def _start_stub() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(_stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+MESSAGES = [{"role": "system", "content": "json"}, {"role": "user", "content": "delete last"}]
+
+
+async def _per_call(base_url: str) -> None:
+    client = AsyncOpenAI(api_key="stub", base_url=base_url)
+    await client.chat.completions.create(model="stub", messages=MESSAGES, response_format={"type": "json_object"})
+
+
+async def _run(mode: str, base_url: str) -> None:
+    from server.ai import client as shared
+
+    async def one() -> float:
+        t0 = time.perf_counter()
+        if mode == "per-call":
+            await _per_call(base_url)
+        else:
+            await shared.chat_json("stub", MESSAGES)
+        return (time.perf_counter() - t0) * 1000.0
+
+    await asyncio.gather(*(one() for _ in range(8)))  # warm-up
+    t0 = time.perf_counter()
+    lat = sorted(await asyncio.gather(*(one() for _ in range(UTTERANCES))))
+    wall = time.perf_counter() - t0
+    if mode == "shared":
+        await shared.aclose()
+    print(f"{mode:8s} n={UTTERANCES} wall={wall:.2f}s throughput={UTTERANCES / wall:6.0f}/s "
+          f"p50={statistics.median(lat):6.1f}ms p99={lat[int(len(lat) * 0.99) - 1]:6.1f}ms")
+
+
+def main() -> None:
+    base_url = _start_stub()
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    for mode in ("per-call", "shared"):
+        asyncio.run(_run(mode, base_url))
+
+
+if __name__ == "__main__":
+    main()
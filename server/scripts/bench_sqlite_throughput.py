@@ -0,0 +1,67 @@
+"""
+Throughput benchmark for the SQLite calendar store: connection handling before/after.
+
+Run from the repo root:
+  python -m server.scripts.bench_sqlite_throughput
+
+"before" patches in the original connection factory (a fresh sqlite3.connect
+per call, default rollback journal, no pragmas) against its own database file;
+"after" uses the store's persistent per-thread WAL connections.
+"""
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_TMP = tempfile.mkdtemp()
+os.environ.setdefault("CAL_DB_PATH", os.path.join(_TMP, "after.db"))
+
+from server.calendarsvc import store_sqlite as sql  # noqa: E402
+
+OPS = 500
+WORKERS = 4
+
+
+def _legacy_conn() -> sqlite3.Connection:
+    c = sqlite3.connect(sql._DB_PATH, check_same_thread=False)
+    c.row_factory = sqlite3.Row
+    return c
+
+
+def _run(label: str) -> None:
+    def _mutate(uid: str) -> None:
+        for i in range(OPS):
+            sql.apply_command(uid, {"type": "create_event", "title": f"e{i}"}, include_events=False)
+
+    def _list(uid: str) -> None:
+        for _ in range(OPS):
+            sql.list_events(uid)
+
+    def _history(uid: str) -> None:
+        for _ in range(OPS):
+            sql.history(uid, limit=20)
+
+    users = [f"{label}-{i}" for i in range(WORKERS)]
+    for name, fn in (("mutate", _mutate), ("list", _list), ("history", _history)):
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(WORKERS) as ex:
+            list(ex.map(fn, users))
+        dt = time.perf_counter() - t0
+        print(f"  {label:<6} {name:<7} {WORKERS * OPS / dt:>8.0f} ops/s")
+
+
+def main() -> None:
+    print(f"sqlite store, {WORKERS} threads x {OPS} ops each")
+    pooled = sql._conn
+    sql._conn = _legacy_conn
+    sql._DB_PATH = os.path.join(_TMP, "before.db")
+    sql._init()
+    _run("before")
+    sql._conn = pooled
+    sql._DB_PATH = os.environ["CAL_DB_PATH"]
+    _run("after")
+
+
+if __name__ == "__main__":
+    main()
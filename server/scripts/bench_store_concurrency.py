@@ -0,0 +1,110 @@
+"""
+Concurrency benchmark for the calendar stores' per-user lock striping.
+
+Run from the repo root:
+  python -m server.scripts.bench_store_concurrency
+
+Each store is run twice in the same process: once with LockStripes(1), which is
+the old single global lock, and once with the default stripes. In both runs one
+"heavy" user keeps its lock busy with a large calendar while SMALL_USERS small
+users mutate or read their own. Reports the small users' throughput and latency.
+
+1) In-memory store: the heavy user mutates with full responses, rendering
+   HEAVY_EVENTS events under its lock each time; small users create events.
+2) SQLite store: the heavy user lists HEAVY_EVENTS rows under its lock; small
+   users read their history.
+
+Striping does not make a single user's work faster, and GIL-bound work does not
+scale with threads either way; what it removes is small users queueing behind
+an unrelated user's lock.
+"""
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple
+
+os.environ.setdefault("CAL_DB_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from server.calendarsvc import store as mem  # noqa: E402
+from server.calendarsvc import store_sqlite as sql  # noqa: E402
+from server.calendarsvc.locks import LockStripes  # noqa: E402
+
+HEAVY = "heavy-user"
+HEAVY_EVENTS = 20_000
+SMALL_USERS = 8
+OPS_PER_USER = 100
+
+
+def _seed() -> None:
+    with mem._lock_for(HEAVY):
+        mem._ensure_user(HEAVY)
+        for i in range(HEAVY_EVENTS):
+            ev = mem.Event(id=f"h{i}", title="h", start=1_761_066_000, end=None, data=None, created_us=0)
+            mem._append_entry(HEAVY, mem._Op(kind="create", event=ev, ts_us=mem._now_us()))
+    sql.apply_batch(HEAVY, [{"type": "create_event", "title": f"h{i}"} for i in range(HEAVY_EVENTS)],
+                    include_events=False)
+    for i in range(SMALL_USERS):
+        sql.apply_batch(f"small-{i}", [{"type": "create_event", "title": f"e{j}"} for j in range(20)],
+                        include_events=False)
+
+
+def _measure(heavy_op: Callable[[], object], small_op: Callable[[str], object]) -> Tuple[float, float, float]:
+    """(small-user ops/s, p50 ms, p99 ms) while heavy_op runs in a loop."""
+    stop = threading.Event()
+
+    def _heavy() -> None:
+        while not stop.is_set():
+            heavy_op()
+
+    def _small(uid: str) -> list:
+        lat = []
+        for _ in range(OPS_PER_USER):
+            t0 = time.perf_counter()
+            small_op(uid)
+            lat.append(time.perf_counter() - t0)
+        return lat
+
+    heavy = threading.Thread(target=_heavy)
+    heavy.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(SMALL_USERS) as ex:
+        lats = [x for chunk in ex.map(_small, [f"small-{i}" for i in range(SMALL_USERS)]) for x in chunk]
+    dt = time.perf_counter() - t0
+    stop.set()
+    heavy.join()
+    lats.sort()
+    return len(lats) / dt, statistics.median(lats) * 1e3, lats[int(len(lats) * 0.99) - 1] * 1e3
+
+
+def _compare(module, heavy_op: Callable[[], object], small_op: Callable[[str], object]) -> None:
+    default = module._LOCKS
+    try:
+        for label, locks in (("global lock", LockStripes(1)), ("striped", default)):
+            module._LOCKS = locks
+            rate, p50, p99 = _measure(heavy_op, small_op)
+            print(f"  {label:<12} {rate:>8.0f} ops/s  p50={p50:.2f}ms  p99={p99:.2f}ms")
+    finally:
+        module._LOCKS = default
+
+
+def main() -> None:
+    _seed()
+    print(f"memory store: small-user creates while a heavy user mutates {HEAVY_EVENTS} events")
+    _compare(
+        mem,
+        lambda: mem.apply_command(HEAVY, {"op": "noop"}),
+        lambda uid: mem.apply_command(uid, {"type": "create_event", "title": "x"}, include_events=False),
+    )
+    print(f"sqlite store: small-user history reads while a heavy user lists {HEAVY_EVENTS} events")
+    _compare(
+        sql,
+        lambda: sql.list_events(HEAVY),
+        lambda uid: sql.history(uid, limit=10),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Memory benchmark: bytes per event held by the in-memory store.
+
+Run from the repo root:
+  python -m server.scripts.bench_store_memory [total_events] [users]
+
+Defaults to 1M events across 10k users. Measures, with tracemalloc, the
+compact view + op log, then the extra cost once every user has been read
+(list_events caches the serialized view). For comparison it also builds the
+previous representation (dataclass with ISO strings + JSON dict in the op log
++ serialized snapshot) for a 10% sample and scales it.
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from server.calendarsvc import store as mem
+
+TITLES = ["Lunch", "Standup", "Dentist", "Gym", "1:1", "Dinner", "Call mom", "Review"]
+BASE_US = 1_761_066_000 * 1_000_000
+
+
+@dataclass
+class _LegacyEvent:
+    id: str
+    title: str
+    start: str
+    end: str
+    data: Dict[str, Any]
+    created_at: str
+
+
+def _fill_compact(users: int, per_user: int) -> None:
+    for u in range(users):
+        uid = f"mem-{u}"
+        with mem._lock_for(uid):
+            mem._ensure_user(uid)
+            for i in range(per_user):
+                now_us = BASE_US + (u * per_user + i) * 1_000_000
+                ev = mem._new_event(TITLES[i % len(TITLES)], mem._iso_from_epoch(now_us // 1_000_000), None, now_us)
+                mem._append_entry(uid, mem._Op(kind="create", event=ev, ts_us=now_us))
+
+
+def _read_all(users: int) -> None:
+    for u in range(users):
+        mem.list_events(f"mem-{u}")
+
+
+def _fill_legacy(users: int, per_user: int) -> list:
+    keep = []
+    for u in range(users):
+        view, log, snap = [], [], []
+        for i in range(per_user):
+            now_us = BASE_US + (u * per_user + i) * 1_000_000
+            start = mem._iso_from_epoch(now_us // 1_000_000)
+            ev = mem._new_event(TITLES[i % len(TITLES)], start, None, now_us)
+            d = ev.to_json()
+            log.append({"kind": "create", "event": d, "ts": d["created_at"]})
+            view.append(_LegacyEvent(**{k: (dict(v) if k == "data" else str(v)) for k, v in d.items()}))
+            snap.append(dict(d))
+        keep.append((view, log, tuple(snap)))
+    return keep
+
+
+def _measure(fn, *args):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return used, result
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    per_user = max(1, total // users)
+    n = users * per_user
+
+    compact, _ = _measure(_fill_compact, users, per_user)
+    print(f"compact view + op log:      {compact / n:8.1f} bytes/event  ({n} events, {users} users)")
+
+    cached, _ = _measure(_read_all, users)
+    print(f"+ serialized read caches:   {cached / n:8.1f} bytes/event  (only for users who list)")
+
+    sample = max(1, users // 10)
+    legacy, keep = _measure(_fill_legacy, sample, per_user)
+    print(f"previous representation:    {legacy / (sample * per_user):8.1f} bytes/event  (sampled {sample} users)")
+    del keep
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark: per-mutation and time-travel cost of the in-memory op-log store
+vs. history size.
+
+Run from the repo root:
+  python -m server.scripts.bench_store_mutations
+
+For each history size it seeds one user, then times:
+  - create + delete_last pairs on the incremental path
+  - time travel 10 ops back (bisect + nearest checkpoint), restored after each run
+  - the old full rebuild per mutation, for comparison
+
+Only the store bookkeeping is timed; serializing the response is excluded.
+Creates include publishing the read snapshot, which copies at most one
+_CHUNK-sized tail of the view, so both columns stay flat as history grows.
+"""
+import bisect
+import time
+
+from server.calendarsvc import store as mem
+
+SIZES = [100, 1_000, 10_000, 20_000]
+ROUNDS = 200
+
+
+def _entry(i: int) -> "mem._Op":
+    ev = mem.Event(id=f"seed-{i}", title="seed", start=1_761_066_000, end=None, data=None, created_us=0)
+    return mem._Op(kind="create", event=ev, ts_us=mem._now_us())
+
+
+def _seed(user_id: str, n: int) -> None:
+    with mem._lock_for(user_id):
+        mem._ensure_user(user_id)
+        for i in range(n):
+            mem._append_entry(user_id, _entry(i))
+
+
+def _time_incremental(user_id: str) -> float:
+    t0 = time.perf_counter()
+    with mem._lock_for(user_id):
+        for _ in range(ROUNDS):
+            mem._append_entry(user_id, _entry(-1))
+            mem._truncate_log(user_id, len(mem._OPLOG[user_id]) - 1)
+    return (time.perf_counter() - t0) / (2 * ROUNDS)
+
+
+def _time_replay(user_id: str) -> float:
+    spent = 0.0
+    with mem._lock_for(user_id):
+        log = mem._OPLOG[user_id]
+        target_us = log[-11].ts_us
+        for _ in range(ROUNDS):
+            before = len(log)
+            tail = log[-20:]
+            t0 = time.perf_counter()
+            mem._truncate_log(user_id, bisect.bisect_right(mem._TS_INDEX[user_id], target_us))
+            spent += time.perf_counter() - t0
+            for entry in tail[len(tail) - (before - len(log)):]:
+                mem._append_entry(user_id, entry)
+    return spent / ROUNDS
+
+
+def _time_rebuild(user_id: str) -> float:
+    rounds = max(1, ROUNDS // 10)
+    t0 = time.perf_counter()
+    with mem._lock_for(user_id):
+        for _ in range(rounds):
+            mem._OPLOG[user_id].append(_entry(-1))
+            mem._rebuild_from_log(user_id)
+            mem._OPLOG[user_id].pop()
+            mem._rebuild_from_log(user_id)
+    return (time.perf_counter() - t0) / (2 * rounds)
+
+
+def main() -> None:
+    print(f"{'ops':>8}  {'incremental us/op':>18}  {'time travel us':>16}  {'full rebuild us/op':>19}")
+    for n in SIZES:
+        uid = f"bench-{n}"
+        _seed(uid, n)
+        inc = _time_incremental(uid)
+        rep = _time_replay(uid)
+        reb = _time_rebuild(uid)
+        assert mem._materialized_matches_log(uid)
+        print(f"{n:>8}  {inc * 1e6:>18.2f}  {rep * 1e6:>16.2f}  {reb * 1e6:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Fan-out latency for one room with 1k sockets.
+
+Compares the previous sequential send_json loop with the queued, encode-once
+ConnectionManager. Sockets are in-memory fakes whose send yields to the loop
+(about what a healthy localhost socket costs); one of them is slow. Latency
+is measured from the broadcast call until every fast socket has the message.
+
+Run from the server/ directory (the routers stack uses bare imports):
+
+    cd server && python -m scripts.bench_ws_fanout
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+
+from utils.connections import ConnectionManager
+
+SOCKETS = 1000
+MESSAGES = 20
+SLOW_DELAY_S = 0.02
+EVENT = {"type": "event_created", "event": {"id": "x" * 36, "title": "Dentist appointment",
+                                             "start_at": "2025-10-13T09:00:00", "end_at": "2025-10-13T10:00:00"}}
+
+
+class _Sock:
+    def __init__(self, slow: bool = False):
+        self.slow = slow
+        self.got = 0
+        self.done = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code=1000):
+        pass
+
+    async def _deliver(self):
+        await asyncio.sleep(SLOW_DELAY_S if self.slow else 0)
+        self.got += 1
+        if self.done and not self.slow and self.got >= self.target:
+            self.done()
+
+    async def send_text(self, text):
+        await self._deliver()
+
+    async def send_json(self, data):
+        json.dumps(data)
+        await self._deliver()
+
+
+async def _legacy_broadcast(socks, message):
+    for ws in list(socks):
+        try:
+            await ws.send_json(message)
+        except Exception:
+            pass
+
+
+async def _measure(mode: str) -> list:
+    socks = [_Sock(slow=(i == 0)) for i in range(SOCKETS)]
+    mgr = ConnectionManager(queue_size=MESSAGES * 2)
+    if mode == "queued":
+        for ws in socks:
+            await mgr.connect("room", ws)
+    lat = []
+    for n in range(1, MESSAGES + 1):
+        pending = SOCKETS - 1
+        fut = asyncio.get_running_loop().create_future()
+
+        def _one():
+            nonlocal pending
+            pending -= 1
+            if pending == 0 and not fut.done():
+                fut.set_result(None)
+
+        for ws in socks:
+            ws.target, ws.done = n, _one
+        t0 = time.perf_counter()
+        if mode == "queued":
+            await mgr.broadcast_room("room", EVENT)
+        else:
+            asyncio.ensure_future(_legacy_broadcast(socks, EVENT))
+        await fut
+        lat.append((time.perf_counter() - t0) * 1000.0)
+    for ws in socks:
+        mgr.disconnect("room", ws)
+    return lat
+
+
+def main() -> None:
+    for mode in ("sequential", "queued"):
+        lat = sorted(asyncio.run(_measure(mode)))
+        print(f"{mode:10s} sockets={SOCKETS} msgs={MESSAGES}  fan-out p50={statistics.median(lat):7.2f}ms "
+              f"max={lat[-1]:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
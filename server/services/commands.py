@@ -0,0 +1,76 @@
+"""Request/response commands carried over the /ws socket.
+
+A client frame is {"id": <request id>, "type": "interpret" | "mutate", ...}.
+Each one gets exactly one reply on the same socket,
+{"type": "response", "id": <request id>, "ok": true, ...result} or
+{"type": "response", "id": <request id>, "ok": false, "error": "..."}.
+An interpret result is {"command": ...}, the same command POST /ai/interpret returns.
+Mutations also fan out to the user's room as the usual versioned change messages.
+"""
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from services.events import AsyncEventsService
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TZ = "America/Los_Angeles"
+
+class CommandError(Exception):
+    """A request the client can fix; the message is sent back as the error."""
+
+async def _interpret(user_id: str, req: Dict[str, Any], events: AsyncEventsService) -> Dict[str, Any]:
+    text = (req.get("text") or "").strip()
+    if not text:
+        raise CommandError("missing text")
+    tz = (req.get("tz") or DEFAULT_TZ).strip() or DEFAULT_TZ
+    # The pipeline behind POST /ai/interpret (fast path, cache, single-flight).
+    # Deferred import: the socket must keep working without the LLM deps installed.
+    from server.ai import pipeline
+    try:
+        command = await pipeline.interpret(text, tz, user_id)
+    except pipeline.InterpretError as e:
+        raise CommandError(f"interpret failed: {e.detail}")
+    except Exception as e:
+        log.warning("ws interpret failed: %s: %s", type(e).__name__, e)
+        raise CommandError(f"interpret failed: {type(e).__name__}")
+    return {"command": command}
+
+async def _mutate(user_id: str, req: Dict[str, Any], events: AsyncEventsService) -> Dict[str, Any]:
+    op = req.get("op")
+    if op == "create_event":
+        ev = req.get("event") or {}
+        if not ev.get("title"):
+            raise CommandError("missing title")
+        created = await events.create(user_id, ev["title"], ev.get("start_at"), ev.get("end_at"), bool(ev.get("all_day", False)))
+        return {"event": created.model_dump()}
+    if op == "delete_event":
+        if not req.get("event_id"):
+            raise CommandError("missing event_id")
+        return {"success": await events.delete_by_id(user_id, req["event_id"])}
+    raise CommandError(f"unsupported op: {op}")
+
+_HANDLERS: Dict[str, Callable[[str, Dict[str, Any], AsyncEventsService], Awaitable[Dict[str, Any]]]] = {
+    "interpret": _interpret,
+    "mutate": _mutate,
+}
+
+async def handle(user_id: str, frame: str, events: AsyncEventsService) -> Dict[str, Any]:
+    rid: Optional[Any] = None
+    try:
+        req = json.loads(frame)
+        if not isinstance(req, dict):
+            raise CommandError("request must be a JSON object")
+        rid = req.get("id")
+        handler = _HANDLERS.get(req.get("type"))
+        if handler is None:
+            raise CommandError(f"unsupported type: {req.get('type')}")
+        result = await handler(user_id, req, events)
+    except json.JSONDecodeError:
+        return {"type": "response", "id": None, "ok": False, "error": "invalid json"}
+    except CommandError as e:
+        return {"type": "response", "id": rid, "ok": False, "error": str(e)}
+    except Exception:
+        log.exception("ws command failed")
+        return {"type": "response", "id": rid, "ok": False, "error": "internal error"}
+    return {"type": "response", "id": rid, "ok": True, **result}
@@ -1,52 +1,212 @@
-from typing import List, Optional
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, text
 from sqlmodel import select
-from db.models import Event
-from db.session import get_session
+from core.config import settings
+from db.models import Event, EventChange
+from db.session import TITLE_FTS, TITLE_KEYS, get_session, title_fts_enabled
 from datetime import datetime
 
+# Dedicated, bounded pool for blocking DB work issued from async handlers. Keeps
+# the event loop (and every WebSocket on it) free while SQL runs, and caps DB
+# concurrency independently of the default executor.
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=settings.db_max_workers, thread_name_prefix="events-db")
+
+async def run_db(fn: Callable[..., Any], *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, partial(fn, *args))
+
+# Trigram FTS can only match needles of at least three characters
+_TRIGRAM_MIN = 3
+# Ids per bulk statement; stays under SQLite's legacy 999-parameter limit
+_BULK_CHUNK = 500
+# Column projection for list_rows: plain tuples, no ORM identity map or model validation
+_ROW_COLUMNS = tuple(Event.__table__.columns)
+_ROW_KEYS = tuple(c.name for c in _ROW_COLUMNS)
+
+# Change log: versions are per user and allocated inside the write transaction,
+# so a change is visible exactly when the write it describes is.
+_SQL_RECORD_CHANGE = text(
+    "INSERT INTO eventchange (user_id, version, message) "
+    "SELECT :u, COALESCE(MAX(version), 0) + 1, :m FROM eventchange WHERE user_id = :u "
+    "RETURNING version"
+)
+_SQL_PRUNE_CHANGES = text("DELETE FROM eventchange WHERE user_id = :u AND version <= :floor")
+_SQL_VERSION = text("SELECT COALESCE(MAX(version), 0) FROM eventchange WHERE user_id = :u")
+
+def _record(s, user_id: str, message: dict, changes: Optional[List[dict]]) -> None:
+    version = s.execute(_SQL_RECORD_CHANGE, {"u": user_id, "m": json.dumps(message, separators=(",", ":"))}).scalar_one()
+    s.execute(_SQL_PRUNE_CHANGES, {"u": user_id, "floor": version - settings.ws_change_window})
+    if changes is not None:
+        changes.append({**message, "version": version})
+
 class EventsService:
     def list(self, user_id: str) -> List[Event]:
         with get_session() as s:
             stmt = select(Event).where(Event.user_id == user_id)
             return list(s.exec(stmt))
 
-    def create(self, user_id: str, title: str, start_at: Optional[str], end_at: Optional[str], all_day: bool=False) -> Event:
+    def list_rows(self, user_id: str) -> List[dict]:
+        """Same payload as [e.dict() for e in list(user_id)], built straight from row tuples."""
+        with get_session() as s:
+            rows = s.execute(select(*_ROW_COLUMNS).where(Event.user_id == user_id)).all()
+        keys = _ROW_KEYS
+        return [dict(zip(keys, r)) for r in rows]
+
+    def snapshot(self, user_id: str) -> Tuple[int, List[dict]]:
+        """list_rows plus the change version it reflects.
+
+        Both come from one statement: pysqlite opens no transaction for a
+        SELECT, so two separate reads could straddle another writer's commit.
+        """
+        current = (
+            select(func.coalesce(func.max(EventChange.version), 0).label("version"))
+            .where(EventChange.user_id == user_id)
+            .subquery()
+        )
+        # One row per event, or a single all-NULL event row when there are none
+        stmt = select(current.c.version, *_ROW_COLUMNS).select_from(current).outerjoin(Event, Event.user_id == user_id)
+        with get_session() as s:
+            rows = s.execute(stmt).all()
+        return rows[0][0], [dict(zip(_ROW_KEYS, r[1:])) for r in rows if r[1] is not None]
+
+    def changes_since(self, user_id: str, since: int) -> Optional[List[dict]]:
+        """Change messages after version `since`, oldest first, or None when the
+        client must resync from a snapshot (gap pruned, or cursor from the future)."""
+        with get_session() as s:
+            current = s.execute(_SQL_VERSION, {"u": user_id}).scalar_one()
+            if since > current:
+                return None
+            rows = s.execute(
+                select(EventChange.version, EventChange.message)
+                .where(EventChange.user_id == user_id, EventChange.version > since)
+                .order_by(EventChange.version)
+            ).all()
+        if since < current and (not rows or rows[0][0] != since + 1):
+            return None
+        return [{**json.loads(m), "version": v} for v, m in rows]
+
+    # Mutations record a change-log entry in the same transaction. Pass a list as
+    # `changes` to receive the versioned broadcast messages that were committed.
+
+    def create(self, user_id: str, title: str, start_at: Optional[str], end_at: Optional[str], all_day: bool=False,
+               changes: Optional[List[dict]] = None) -> Event:
         now_iso = datetime.utcnow().isoformat()
         ev = Event(user_id=user_id, title=title, start_at=start_at, end_at=end_at, all_day=all_day, created_at=now_iso, updated_at=now_iso)
         with get_session() as s:
             s.add(ev)
+            _record(s, user_id, {"type": "event_created", "event": ev.model_dump()}, changes)
             s.commit()
             s.refresh(ev)
         return ev
 
-    def delete_by_id(self, user_id: str, event_id: str) -> bool:
+    def delete_by_id(self, user_id: str, event_id: str, changes: Optional[List[dict]] = None) -> bool:
         with get_session() as s:
             ev = s.get(Event, event_id)
             if not ev or ev.user_id != user_id:
                 return False
             s.delete(ev)
+            _record(s, user_id, {"type": "event_deleted", "event_id": event_id}, changes)
             s.commit()
             return True
 
     def find_by_title_window(self, user_id: str, title_like: str, start_after: Optional[str]=None, start_before: Optional[str]=None) -> List[Event]:
         with get_session() as s:
             stmt = select(Event).where(Event.user_id == user_id)
-            if title_like:
-                stmt = stmt.where(Event.title.ilike(f"%{title_like}%"))
-            results = list(s.exec(stmt))
+            # Window on (user_id, start_at); NULL start_at never matches a bound
             if start_after:
-                results = [e for e in results if e.start_at and e.start_at >= start_after]
+                stmt = stmt.where(Event.start_at >= start_after)
             if start_before:
-                results = [e for e in results if e.start_at and e.start_at < start_before]
-            return results
+                stmt = stmt.where(Event.start_at < start_before)
+            if title_like:
+                if title_fts_enabled() and len(title_like) >= _TRIGRAM_MIN:
+                    phrase = '"' + title_like.replace('"', '""') + '"'
+                    matches = f"SELECT rowid FROM {TITLE_FTS} WHERE {TITLE_FTS} MATCH :title_q"
+                    if start_after or start_before:
+                        # Walk the window and probe each row's title key against the match set
+                        cond = f"(SELECT fts_rowid FROM {TITLE_KEYS} WHERE event_id = event.id) IN ({matches})"
+                    else:
+                        cond = f"event.id IN (SELECT event_id FROM {TITLE_KEYS} WHERE fts_rowid IN ({matches}))"
+                    stmt = stmt.where(text(cond).bindparams(title_q=phrase))
+                else:
+                    stmt = stmt.where(Event.title.ilike(f"%{title_like}%"))
+            return list(s.exec(stmt))
 
-    def delete_many(self, user_id: str, ids: List[str]) -> int:
-        count = 0
+    def create_many(self, user_id: str, items: List[dict], changes: Optional[List[dict]] = None) -> List[Event]:
+        """Insert several events in one transaction. Each item carries
+        title, start_at, end_at and optionally all_day."""
+        now_iso = datetime.utcnow().isoformat()
+        evs = [
+            Event(user_id=user_id, title=it["title"], start_at=it.get("start_at"), end_at=it.get("end_at"),
+                  all_day=bool(it.get("all_day", False)), created_at=now_iso, updated_at=now_iso)
+            for it in items
+        ]
+        if not evs:
+            return []
+        rows = [ev.model_dump() for ev in evs]
+        with get_session() as s:
+            s.execute(insert(Event), rows)
+            _record(s, user_id, {"type": "events_created", "events": rows}, changes)
+            s.commit()
+        return evs
+
+    def delete_many(self, user_id: str, ids: List[str], changes: Optional[List[dict]] = None) -> List[str]:
+        """Delete the caller's events among ids; returns the ids actually removed."""
+        deleted: List[str] = []
+        unique = list(dict.fromkeys(ids))
         with get_session() as s:
-            for id_ in ids:
-                ev = s.get(Event, id_)
-                if ev and ev.user_id == user_id:
-                    s.delete(ev)
-                    count += 1
+            for i in range(0, len(unique), _BULK_CHUNK):
+                chunk = unique[i:i + _BULK_CHUNK]
+                stmt = delete(Event).where(Event.user_id == user_id, Event.id.in_(chunk)).returning(Event.id)
+                deleted.extend(s.execute(stmt).scalars())
+            if deleted:
+                _record(s, user_id, {"type": "events_deleted", "event_ids": deleted}, changes)
             s.commit()
-        return count
+        return deleted
+
+class AsyncEventsService:
+    """Awaitable EventsService for async routes; each call runs on the DB executor.
+    Committed changes are handed to `on_change(user_id, message)`, e.g. a room broadcast."""
+
+    def __init__(self, sync: Optional[EventsService] = None,
+                 on_change: Optional[Callable[[str, dict], Awaitable[None]]] = None):
+        self.sync = sync or EventsService()
+        self.on_change = on_change
+
+    async def _mutate(self, fn: Callable[..., Any], user_id: str, *args: Any) -> Any:
+        changes: List[dict] = []
+        result = await run_db(partial(fn, changes=changes), user_id, *args)
+        if self.on_change:
+            for message in changes:
+                await self.on_change(user_id, message)
+        return result
+
+    async def list(self, user_id: str) -> List[Event]:
+        return await run_db(self.sync.list, user_id)
+
+    async def list_rows(self, user_id: str) -> List[dict]:
+        return await run_db(self.sync.list_rows, user_id)
+
+    async def snapshot(self, user_id: str) -> Tuple[int, List[dict]]:
+        return await run_db(self.sync.snapshot, user_id)
+
+    async def changes_since(self, user_id: str, since: int) -> Optional[List[dict]]:
+        return await run_db(self.sync.changes_since, user_id, since)
+
+    async def create(self, user_id: str, title: str, start_at: Optional[str], end_at: Optional[str], all_day: bool=False) -> Event:
+        return await self._mutate(self.sync.create, user_id, title, start_at, end_at, all_day)
+
+    async def delete_by_id(self, user_id: str, event_id: str) -> bool:
+        return await self._mutate(self.sync.delete_by_id, user_id, event_id)
+
+    async def find_by_title_window(self, user_id: str, title_like: str, start_after: Optional[str]=None, start_before: Optional[str]=None) -> List[Event]:
+        return await run_db(self.sync.find_by_title_window, user_id, title_like, start_after, start_before)
+
+    async def create_many(self, user_id: str, items: List[dict]) -> List[Event]:
+        return await self._mutate(self.sync.create_many, user_id, items)
+
+    async def delete_many(self, user_id: str, ids: List[str]) -> List[str]:
+        return await self._mutate(self.sync.delete_many, user_id, ids)
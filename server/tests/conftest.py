@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The routers stack (services/, db/, core/, utils/) uses bare imports rooted at
+# server/, and core.config reads DATABASE_URL once, at first import.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "events.db"))
+
+
+# Shared setup for the interpret pipeline and /ai route tests. Imports are
+# deferred so routers-stack tests never load the routes stack.
+
+@pytest.fixture
+def interpret_cache(monkeypatch):
+    """An empty interpretation cache for the interpret pipeline."""
+    from server.ai import pipeline
+    from server.ai.cache import InterpretCache
+
+    cache = InterpretCache()
+    monkeypatch.setattr(pipeline, "_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def ai_client(monkeypatch, interpret_cache):
+    """TestClient for the /ai routes with auth bypassed and an empty interpretation cache."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from server.routes import ai
+
+    monkeypatch.setenv("AUTH_BYPASS", "1")
+    monkeypatch.delenv("AUTH_REQUIRED", raising=False)
+    app = FastAPI()
+    app.include_router(ai.router)
+    return TestClient(app)
@@ -0,0 +1,29 @@
+from server.ai.cache import InterpretCache
+
+CREATE = {"type": "create_event", "title": "Lunch", "start": "2025-10-16T12:00:00-07:00", "end": "2025-10-16T12:30:00-07:00"}
+
+
+def test_normalized_hits_and_time_bucket():
+    c = InterpretCache(maxsize=8, ttl_s=600, bucket_s=60)
+    c.put("Lunch tomorrow at noon", "America/Los_Angeles", CREATE, now=1000)
+    assert c.get("  lunch   TOMORROW at noon. ", "America/Los_Angeles", now=1010) == CREATE
+    assert c.get("lunch tomorrow at noon", "Europe/Paris", now=1010) is None
+    # Timed commands expire with their bucket so relative dates stay correct
+    assert c.get("lunch tomorrow at noon", "America/Los_Angeles", now=1090) is None
+
+    c.put("delete last", "UTC", {"op": "delete_last"}, now=1000)
+    assert c.get("Delete last!", "UTC", now=1500) == {"op": "delete_last"}
+    assert c.get("delete last", "UTC", now=1700) is None
+
+    s = c.stats()
+    assert (s["hits"], s["misses"]) == (2, 3)
+
+
+def test_lru_bound_and_copies():
+    c = InterpretCache(maxsize=2, ttl_s=600, bucket_s=60)
+    for t in ("a", "b", "c"):
+        c.put(t, "UTC", {"op": "delete_last"}, now=0)
+    assert c.get("a", "UTC", now=1) is None and c.stats()["evictions"] == 1
+    got = c.get("c", "UTC", now=1)
+    got["op"] = "mutated"
+    assert c.get("c", "UTC", now=1) == {"op": "delete_last"}
@@ -0,0 +1,14 @@
+from server.ai import pipeline
+
+
+def test_execute_interprets_and_applies_in_one_request(ai_client, monkeypatch):
+    async def fake_llm(text, tz, now_iso):
+        return {"type": "create_event", "title": "Lunch",
+                "start": "2025-10-16T12:00:00-07:00", "end": "2025-10-16T12:30:00-07:00"}
+
+    monkeypatch.setattr(pipeline, "_llm_interpret", fake_llm)
+    r = ai_client.post("/ai/execute?delta=true", json={"text": "lunch at noon", "tz": "America/Los_Angeles"}).json()
+    assert r["applied"] is True and r["command"]["title"] == "Lunch"
+    assert r["result"]["status"] == "ok" and r["result"]["diff"]["type"] == "create"
+    assert "events" not in r["result"]
+    assert ai_client.post("/ai/execute", json={"text": " "}).status_code == 400
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from server.ai.singleflight import SingleFlight
+
+
+def test_concurrent_duplicates_share_one_call():
+    calls = []
+
+    async def run():
+        sf = SingleFlight()
+
+        async def llm(tag):
+            calls.append(tag)
+            await asyncio.sleep(0.02)
+            return {"op": "delete_last", "tag": tag}
+
+        same = [sf.do(("u1", "delete last", "UTC"), lambda: llm("a")) for _ in range(5)]
+        other = sf.do(("u2", "delete last", "UTC"), lambda: llm("b"))
+        results = await asyncio.gather(*same, other)
+        assert calls == ["a", "b"]
+        assert results[:5] == [{"op": "delete_last", "tag": "a"}] * 5
+        assert results[0] is not results[1]  # each waiter gets its own copy
+        assert sf.stats() == {"inflight": 0, "leaders": 2, "joined": 4}
+
+        # Once finished, the key is free again
+        await sf.do(("u1", "delete last", "UTC"), lambda: llm("c"))
+        assert calls[-1] == "c"
+
+    asyncio.run(run())
+
+
+def test_errors_reach_every_waiter_and_cancelled_waiter_does_not_cancel_leader():
+    async def run():
+        sf = SingleFlight()
+        gate = asyncio.Event()
+
+        async def boom():
+            await gate.wait()
+            raise RuntimeError("llm down")
+
+        first = asyncio.ensure_future(sf.do("k", boom))
+        second = asyncio.ensure_future(sf.do("k", boom))
+        await asyncio.sleep(0)
+        first.cancel()
+        gate.set()
+        with pytest.raises(RuntimeError):
+            await second
+
+    asyncio.run(run())
@@ -0,0 +1,59 @@
+import json
+
+from server.ai import pipeline
+from server.ai.stream import FieldStream
+
+RAW = ('{"type": "create_event", "title": "Lunch, with \\"Sam\\" {x}", '
+       '"meta": {"a": [1, 2]}, "start": "2025-10-16T12:00:00-07:00", "end": "2025-10-16T12:30:00-07:00"}')
+
+
+def test_field_stream_reports_fields_as_they_complete():
+    fs = FieldStream()
+    seen = []
+    for ch in RAW:
+        seen.extend(fs.feed(ch))
+    assert seen == ["type", "title", "meta", "start", "end"]
+    assert fs.done and fs.fields == json.loads(RAW)
+
+
+def _events(body):
+    out = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_interpret_stream_sse(ai_client, monkeypatch):
+    async def fake_stream(text, tz, now_iso):
+        for i in range(0, len(RAW), 7):
+            yield RAW[i:i + 7]
+
+    monkeypatch.setattr(pipeline, "_llm_stream", fake_stream)
+
+    r = ai_client.post("/ai/interpret/stream", json={"text": "lunch with sam at noon"})
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _events(r.text)
+    partials = [d["fields"] for e, d in events if e == "partial"]
+    assert partials[0] == {"type": "create_event"}
+    assert partials[1]["title"] == 'Lunch, with "Sam" {x}'
+    assert events[-1][0] == "command" and events[-1][1]["command"]["end"] == "2025-10-16T12:30:00-07:00"
+
+    # Fast-path answers skip the LLM and arrive as a single command event
+    events = _events(ai_client.post("/ai/interpret/stream", json={"text": "delete last"}).text)
+    assert events == [("command", {"command": {"op": "delete_last"}, "user": {"sub": "dev-bypass", "email": "dev@local"}})]
+
+
+def test_interpret_stream_reports_provider_errors(ai_client, monkeypatch):
+    async def failing_stream(text, tz, now_iso):
+        yield '{"type": "create_event", '
+        raise TimeoutError("read timed out")
+
+    monkeypatch.setattr(pipeline, "_llm_stream", failing_stream)
+
+    r = ai_client.post("/ai/interpret/stream", json={"text": "lunch with sam at noon"})
+    assert r.status_code == 200
+    assert _events(r.text) == [
+        ("partial", {"fields": {"type": "create_event"}}),
+        ("error", {"status": 502, "detail": "Interpreter failed: TimeoutError"}),
+    ]
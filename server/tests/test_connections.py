@@ -0,0 +1,236 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+
+from db.session import init_db
+from services.events import AsyncEventsService
+from utils.backplane import UnixSocketBackplane
+from utils.connections import DISCONNECT, DROP, ConnectionManager
+
+init_db()
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_broadcast_encodes_once_and_preserves_order():
+    async def run():
+        mgr = ConnectionManager()
+        socks = [FakeSocket() for _ in range(3)]
+        for ws in socks:
+            await mgr.connect("u", ws)
+        await mgr.send("u", socks[0], {"type": "initial_events", "events": []})
+        await mgr.broadcast_room("u", {"type": "event_created", "n": 1})
+        await mgr.broadcast_room("u", {"type": "event_created", "n": 2})
+        await _drain()
+        assert [len(ws.sent) for ws in socks] == [3, 2, 2]
+        assert '"initial_events"' in socks[0].sent[0]
+        # The same encoded string object is shared by every socket
+        assert socks[1].sent[0] is socks[2].sent[0]
+        for ws in socks:
+            mgr.disconnect("u", ws)
+        assert mgr.rooms == {}
+
+    asyncio.run(run())
+
+
+def test_slow_consumer_policies():
+    async def run(policy):
+        mgr = ConnectionManager(queue_size=2, slow_policy=policy)
+        fast, slow = FakeSocket(), FakeSocket(delay=10)
+        await mgr.connect("u", fast)
+        await mgr.connect("u", slow)
+        for i in range(6):
+            await mgr.broadcast_room("u", {"n": i})
+            await _drain()
+        return mgr, fast, slow
+
+    async def both():
+        mgr, fast, slow = await run(DISCONNECT)
+        assert len(fast.sent) == 6
+        assert slow.closed == 1013 and list(mgr.rooms["u"]) == [fast]
+        mgr.disconnect("u", fast)
+
+        mgr, fast, slow = await run(DROP)
+        assert len(fast.sent) == 6
+        assert slow.closed is None and mgr.rooms["u"][slow].dropped == 3
+        for ws in (fast, slow):
+            mgr.disconnect("u", ws)
+
+    asyncio.run(both())
+
+
+def test_commit_during_sync_is_neither_lost_nor_reordered():
+    async def run():
+        uid = "t-sync-gap"
+        mgr = ConnectionManager()
+        svc = AsyncEventsService(on_change=mgr.broadcast_room)
+        await svc.create(uid, "before", None, None)
+        ws = FakeSocket()
+
+        # The /ws handshake: join paused, read the snapshot, resume
+        await mgr.connect(uid, ws, paused=True)
+        await svc.create(uid, "between connect and snapshot", None, None)
+        version, rows = await svc.snapshot(uid)
+        await svc.create(uid, "between snapshot and resume", None, None)
+        mgr.resume(uid, ws, {"type": "initial_events", "version": version, "events": rows})
+        await svc.create(uid, "after resume", None, None)
+        await _drain()
+
+        # A client that skips anything not above its version cursor
+        cursor, titles = 0, set()
+        for text in ws.sent:
+            msg = json.loads(text)
+            if msg["version"] <= cursor:
+                continue
+            cursor = msg["version"]
+            if msg["type"] == "initial_events":
+                titles = {e["title"] for e in msg["events"]}
+            elif msg["type"] == "event_created":
+                titles.add(msg["event"]["title"])
+        assert json.loads(ws.sent[0])["type"] == "initial_events"
+        assert titles == {e["title"] for e in await svc.list_rows(uid)}
+        assert len(titles) == 4
+        mgr.disconnect(uid, ws)
+
+    asyncio.run(run())
+
+
+def test_unix_backplane_reaches_other_workers():
+    async def run():
+        directory = tempfile.mkdtemp(prefix="ws-")
+        # A worker that died without unlinking its socket
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        stale.bind(os.path.join(directory, "dead.sock"))
+        stale.close()
+
+        a = ConnectionManager(backplane=UnixSocketBackplane(directory))
+        b = ConnectionManager(backplane=UnixSocketBackplane(directory))
+        await a.start()
+        await b.start()
+        on_a, on_b = FakeSocket(), FakeSocket()
+        await a.connect("u", on_a)
+        await b.connect("u", on_b)
+
+        await a.broadcast_room("u", {"type": "event_created", "n": 1})
+        for _ in range(50):
+            if on_b.sent:
+                break
+            await asyncio.sleep(0.01)
+        assert on_a.sent == on_b.sent == ['{"type":"event_created","n":1}']
+        assert not os.path.exists(os.path.join(directory, "dead.sock"))
+
+        for mgr, ws in ((a, on_a), (b, on_b)):
+            mgr.disconnect("u", ws)
+            await mgr.stop()
+        assert os.listdir(directory) == []
+
+    asyncio.run(run())
+
+
+def test_unix_backplane_fragments_large_messages_and_resyncs_on_loss(monkeypatch):
+    monkeypatch.setattr("utils.backplane._SEND_DEADLINE_S", 0.05)
+    monkeypatch.setattr("utils.backplane._PARTIAL_TTL_S", 0.05)
+
+    async def run():
+        directory = tempfile.mkdtemp(prefix="ws-")
+        a = ConnectionManager(backplane=UnixSocketBackplane(directory))
+        b = ConnectionManager(backplane=UnixSocketBackplane(directory))
+        await a.start()
+        await b.start()
+        on_b = FakeSocket()
+        await b.connect("u", on_b)
+
+        # ~1 MB: more fragments than a peer queue holds at once
+        big = {"type": "events_created", "events": [{"title": "x" * 200, "n": i} for i in range(4000)]}
+        await a.broadcast_room("u", big)
+        for _ in range(100):
+            if on_b.sent:
+                break
+            await asyncio.sleep(0.01)
+        assert json.loads(on_b.sent[0]) == big
+        assert a.backplane.dropped == 0
+
+        # b stops reading: the message is given up on, and b is told to resync
+        b.backplane._transport.pause_reading()
+        await a.broadcast_room("u", big)
+        assert a.backplane.dropped == 1
+        b.backplane._transport.resume_reading()
+        await asyncio.sleep(0.1)
+        await a.broadcast_room("u", {"type": "event_created", "n": 2})
+        for _ in range(50):
+            if on_b.closed:
+                break
+            await asyncio.sleep(0.01)
+        assert on_b.closed == 1013 and "u" not in b.rooms
+
+        for mgr in (a, b):
+            await mgr.stop()
+
+    asyncio.run(run())
+
+
+def test_coalescing_window_batches_bursts():
+    async def run():
+        mgr = ConnectionManager(coalesce_ms=20)
+        ws = FakeSocket()
+        await mgr.connect("u", ws)
+        for i in range(3):
+            await mgr.broadcast_room("u", {"n": i})
+        await _drain()
+        assert ws.sent == []
+        await asyncio.sleep(0.05)
+        assert ws.sent == ['{"type":"batch","messages":[{"n":0},{"n":1},{"n":2}]}']
+
+        # A lone message in a window is sent unwrapped
+        await mgr.broadcast_room("u", {"n": 3})
+        await asyncio.sleep(0.05)
+        assert ws.sent[-1] == '{"n":3}'
+        mgr.disconnect("u", ws)
+
+    asyncio.run(run())
+
+
+def test_early_coalesce_flush_does_not_shorten_the_next_window(monkeypatch):
+    monkeypatch.setattr("utils.connections._COALESCE_MAX", 2)
+
+    async def run():
+        mgr = ConnectionManager(coalesce_ms=60)
+        ws = FakeSocket()
+        await mgr.connect("u", ws)
+        await mgr.broadcast_room("u", {"n": 0})
+        await mgr.broadcast_room("u", {"n": 1})  # full: flushed now
+        await _drain()
+        assert len(ws.sent) == 1
+        await asyncio.sleep(0.03)
+        await mgr.broadcast_room("u", {"n": 2})
+        # The first window's timer would have fired by now
+        await asyncio.sleep(0.045)
+        assert len(ws.sent) == 1
+        await asyncio.sleep(0.04)
+        assert ws.sent[-1] == '{"n":2}'
+        mgr.disconnect("u", ws)
+
+    asyncio.run(run())
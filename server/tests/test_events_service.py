@@ -0,0 +1,125 @@
+import threading
+
+from sqlalchemy import event, text
+from db.session import engine, init_db, title_fts_enabled
+from services.events import EventsService
+
+init_db()
+svc = EventsService()
+
+
+def test_find_by_title_window_filters_in_sql():
+    uid = "t-find"
+    for title, start in [
+        ("Dentist appointment", "2025-10-14T09:00:00"),
+        ("dentist follow-up", "2025-10-28T09:00:00"),
+        ("Team standup", "2025-10-14T10:00:00"),
+        ("Dentist (no time)", None),
+    ]:
+        svc.create(uid, title, start, None)
+    svc.create("someone-else", "Dentist appointment", "2025-10-14T09:00:00", None)
+
+    hits = svc.find_by_title_window(uid, "DENTIST", "2025-10-13T00:00:00", "2025-10-20T00:00:00")
+    assert [e.title for e in hits] == ["Dentist appointment"]
+    assert {e.title for e in svc.find_by_title_window(uid, "dentist")} == {
+        "Dentist appointment", "dentist follow-up", "Dentist (no time)"}
+    # Needles shorter than a trigram fall back to ILIKE
+    assert {e.title for e in svc.find_by_title_window(uid, "up")} == {"dentist follow-up", "Team standup"}
+
+    ev = svc.find_by_title_window(uid, "standup")[0]
+    assert svc.delete_by_id(uid, ev.id)
+    assert svc.find_by_title_window(uid, "standup") == []
+
+
+def test_title_search_uses_fts_and_window_index():
+    assert title_fts_enabled()
+    with engine.connect() as cx:
+        plan = " ".join(r[-1] for r in cx.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM event WHERE user_id = 'u' AND start_at >= 'a' AND start_at < 'b' "
+            "AND (SELECT fts_rowid FROM event_title_key WHERE event_id = event.id) "
+            "IN (SELECT rowid FROM event_title_fts WHERE event_title_fts MATCH '\"dentist\"')"
+        )))
+    assert "ix_event_user_start" in plan
+    assert "VIRTUAL TABLE INDEX" in plan
+
+
+def test_bulk_create_and_delete_many():
+    uid = "t-bulk"
+    evs = svc.create_many(uid, [{"title": f"bulk {i}", "start_at": f"2025-11-{i + 1:02d}T09:00:00"} for i in range(1200)])
+    other = svc.create("t-bulk-other", "not mine", None, None)
+    assert len(evs) == 1200 and len(svc.list(uid)) == 1200
+
+    # Spans several chunks; unknown and foreign ids are ignored, duplicates counted once
+    ids = [e.id for e in evs[:1100]] + [evs[0].id, "missing", other.id]
+    deleted = svc.delete_many(uid, ids)
+    assert sorted(deleted) == sorted(e.id for e in evs[:1100])
+    assert {e.id for e in svc.list(uid)} == {e.id for e in evs[1100:]}
+    assert len(svc.list("t-bulk-other")) == 1
+    # The title index follows bulk deletes
+    assert len(svc.find_by_title_window(uid, "bulk")) == 100
+
+
+def test_list_rows_matches_model_dump():
+    uid = "t-rows"
+    svc.create(uid, "a", "2025-10-13T09:00:00", "2025-10-13T10:00:00", all_day=True)
+    svc.create(uid, "b", None, None)
+    rows = svc.list_rows(uid)
+    assert sorted(rows, key=lambda r: r["id"]) == sorted((e.model_dump() for e in svc.list(uid)), key=lambda r: r["id"])
+    assert {r["all_day"] for r in rows} == {True, False}
+
+
+def test_change_log_resume_and_window(monkeypatch):
+    uid = "t-changes"
+    changes = []
+    a = svc.create(uid, "a", None, None, changes=changes)
+    svc.create(uid, "b", None, None, changes=changes)
+    svc.delete_by_id(uid, a.id, changes=changes)
+    assert [(c["type"], c["version"]) for c in changes] == [("event_created", 1), ("event_created", 2), ("event_deleted", 3)]
+
+    version, rows = svc.snapshot(uid)
+    assert version == 3 and [r["title"] for r in rows] == ["b"]
+    assert svc.changes_since(uid, 1) == changes[1:]
+    assert svc.changes_since(uid, 3) == []
+    assert svc.changes_since(uid, 9) is None
+
+    monkeypatch.setattr("services.events.settings.ws_change_window", 2)
+    svc.create_many(uid, [{"title": "c"}, {"title": "d"}])
+    assert [c["version"] for c in svc.changes_since(uid, 2)] == [3, 4]
+    # Version 2 was pruned: a client at 1 has to take a snapshot
+    assert svc.changes_since(uid, 1) is None
+
+
+def test_snapshot_is_consistent_with_concurrent_commits():
+    uid = "t-snapshot-race"
+    svc.create(uid, "seed", None, None)
+    reader = threading.get_ident()
+
+    def commit_first(conn, cursor, statement, parameters, context, executemany):
+        # Before each of snapshot's statements, another thread commits a create
+        if threading.get_ident() == reader:
+            writer = threading.Thread(target=svc.create, args=(uid, "racer", None, None))
+            writer.start()
+            writer.join()
+
+    event.listen(engine, "before_cursor_execute", commit_first)
+    try:
+        version, rows = svc.snapshot(uid)
+    finally:
+        event.remove(engine, "before_cursor_execute", commit_first)
+    # Every create is one event and one version: rows must be exactly what `version` covers
+    assert len(rows) == version
+    assert svc.changes_since(uid, version) == []
+
+
+def test_title_index_survives_vacuum():
+    uid = "t-vacuum"
+    evs = svc.create_many(uid, [{"title": f"filler {i}"} for i in range(50)] + [{"title": "Vacuum dentist"}])
+    # Leave rowid gaps so VACUUM has something to renumber
+    svc.delete_many(uid, [e.id for e in evs[:40]])
+    with engine.begin() as cx:
+        # VACUUM may renumber rowids of a table without an INTEGER PRIMARY KEY; do it explicitly
+        cx.exec_driver_sql("UPDATE event SET rowid = rowid + 100000 WHERE user_id = 't-vacuum'")
+    with engine.connect() as cx:
+        cx.exec_driver_sql("VACUUM")
+    assert [e.title for e in svc.find_by_title_window(uid, "vacuum dentist")] == ["Vacuum dentist"]
+    assert len(svc.find_by_title_window(uid, "filler")) == 10
@@ -0,0 +1,35 @@
+import json
+import os
+from datetime import datetime
+
+from server.ai.nlp import fast_parse
+
+_CORPUS = os.path.join(os.path.dirname(__file__), "data", "fastpath_corpus.jsonl")
+
+
+def _corpus():
+    with open(_CORPUS) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_fastpath_corpus_accuracy_and_coverage():
+    items = _corpus()
+    answered = wrong = 0
+    for it in items:
+        got = fast_parse(it["text"], it["tz"], datetime.fromisoformat(it["now"]))
+        if got.command is None:
+            continue
+        answered += 1
+        if got.command != it["expect"]:
+            wrong += 1
+    simple = sum(1 for it in items if it["expect"] is not None)
+    # Anything answered locally must match the label exactly (including the
+    # utterances labelled for escalation), and most simple commands are covered.
+    assert wrong == 0
+    assert answered / simple >= 0.9
+
+
+def test_fastpath_low_confidence_is_escalated():
+    now = datetime.fromisoformat("2025-10-15T10:00:00-07:00")
+    assert fast_parse("call mom friday at 3", "America/Los_Angeles", now).confidence < 0.9
+    assert fast_parse("lunch tomorrow at noon", "America/Los_Angeles", now).confidence >= 0.9
@@ -0,0 +1,169 @@
+from server.calendarsvc import store
+
+
+def test_incremental_view_matches_full_rebuild():
+    uid = "t-incremental"
+    for i in range(5):
+        store.apply_command(uid, {"type": "create_event", "title": f"e{i}", "start": "2025-10-21T17:00:00Z"})
+    store.apply_command(uid, {"op": "delete_last"})
+    store.apply_command(uid, {"op": "undo_n", "n": 2})
+    res = store.apply_command(uid, {"type": "create_event", "title": "last"})
+
+    assert [e["title"] for e in res["events"]] == ["e0", "e1", "last"]
+    with store._lock_for(uid):
+        assert store._materialized_matches_log(uid)
+
+
+def test_replay_to_ts_restores_from_checkpoint(monkeypatch):
+    monkeypatch.setattr(store, "_CHECKPOINT_EVERY", 4)
+    uid = "t-replay"
+    for i in range(10):
+        store.apply_command(uid, {"type": "create_event", "title": f"e{i}"})
+    with store._lock_for(uid):
+        cut_us = store._OPLOG[uid][5].ts_us
+        keep = sum(1 for op in store._OPLOG[uid] if op.ts_us <= cut_us)
+        cut_ts = store._iso_from_us(cut_us)
+
+    res = store.apply_command(uid, {"op": "replay_to_ts", "ts": cut_ts})
+    assert [e["title"] for e in res["events"]] == [f"e{i}" for i in range(keep)]
+
+    res = store.apply_command(uid, {"op": "replay_n", "n": 2})
+    assert res["diff"]["count"] == 2
+    assert len(res["events"]) == keep - 2
+    with store._lock_for(uid):
+        assert store._materialized_matches_log(uid)
+
+
+def test_reads_do_not_wait_for_writers():
+    import threading
+
+    uid = "t-rcu"
+    store.apply_command(uid, {"type": "create_event", "title": "a"})
+    held, release = threading.Event(), threading.Event()
+
+    def _writer_holding_lock():
+        with store._lock_for(uid):
+            held.set()
+            release.wait(5)
+
+    t = threading.Thread(target=_writer_holding_lock)
+    t.start()
+    held.wait(5)
+    try:
+        assert [e["title"] for e in store.list_events(uid)] == ["a"]
+        assert store.history(uid)["total"] == 1
+    finally:
+        release.set()
+        t.join()
+
+
+def test_held_snapshot_survives_truncate_and_append(monkeypatch):
+    monkeypatch.setattr(store, "_CHUNK", 4)
+    uid = "t-chunks"
+    for i in range(10):
+        store.apply_command(uid, {"type": "create_event", "title": f"e{i}", "start": f"2025-10-{i + 1:02d}T09:00:00Z"})
+    store.list_events(uid)
+    held = store._SNAPSHOTS[uid]
+
+    # Cut back into an earlier chunk, then grow past the old length
+    store.apply_command(uid, {"op": "undo_n", "n": 7})
+    for i in range(9):
+        store.apply_command(uid, {"type": "create_event", "title": f"n{i}", "start": f"2025-11-{i + 1:02d}T09:00:00Z"})
+
+    assert [e["title"] for e in held.events_json()] == [f"e{i}" for i in range(10)]
+    assert [e.title for e in held.events] == [f"e{i}" for i in range(10)]
+    assert [e["title"] for e in store.list_events(uid)] == ["e0", "e1", "e2"] + [f"n{i}" for i in range(9)]
+    assert [e["title"] for e in store.list_events(uid, start="2025-10-02T00:00:00Z", end="2025-11-03T00:00:00Z")] == \
+        ["e1", "e2", "n0", "n1"]
+    assert [i["event"]["title"] for i in store.history(uid, limit=3)["items"]] == ["n8", "n7", "n6"]
+    with store._lock_for(uid):
+        assert store._materialized_matches_log(uid)
+
+
+def test_compact_times_render_back_to_iso():
+    ev = store.apply_command("t-compact", {
+        "type": "create_event", "title": "lunch", "start": "2025-10-16T12:00:00-07:00",
+    })["diff"]["event"]
+    assert (ev["start"], ev["end"]) == ("2025-10-16T19:00:00Z", "2025-10-16T20:00:00Z")
+
+    naive = store.apply_command("t-compact", {"type": "create_event", "start": "2025-10-16T12:00:00"})
+    assert naive["diff"]["event"]["start"] == "2025-10-16T12:00:00"
+
+
+def test_list_events_time_window():
+    uid = "t-window"
+    for title, start, end in [
+        ("long", "2025-10-01T00:00:00Z", "2025-10-20T00:00:00Z"),
+        ("mon", "2025-10-13T09:00:00Z", "2025-10-13T10:00:00Z"),
+        ("sun", "2025-10-19T23:00:00Z", "2025-10-20T01:00:00Z"),
+        ("next", "2025-10-20T09:00:00Z", "2025-10-20T10:00:00Z"),
+        ("before", "2025-10-12T22:00:00Z", "2025-10-13T00:00:00Z"),
+    ]:
+        store.apply_command(uid, {"type": "create_event", "title": title, "start": start, "end": end})
+
+    def titles():
+        return [e["title"] for e in store.list_events(uid, start="2025-10-13T00:00:00Z", end="2025-10-20T00:00:00Z")]
+
+    assert titles() == ["long", "mon", "sun"]
+    store.apply_command(uid, {"op": "undo_n", "n": 3})
+    assert titles() == ["long", "mon"]
+
+
+def test_delta_mode_omits_events_and_versions_increase():
+    uid = "t-delta"
+    a = store.apply_command(uid, {"type": "create_event", "title": "a"}, include_events=False)
+    b = store.apply_command(uid, {"op": "delete_last"}, include_events=False)
+    assert "events" not in a and "events" not in b
+    assert a["diff"]["type"] == "create"
+    assert b["version"] > a["version"]
+    assert store.apply_command(uid, {"op": "noop"})["version"] == b["version"]
+
+
+def test_delta_client_rebuilds_state_from_diffs(monkeypatch):
+    clock = iter(range(1_761_066_000_000_000, 1_761_066_000_000_000 + 10**9, 1_000_000))
+    monkeypatch.setattr(store, "_now_us", lambda: next(clock))
+    uid = "t-delta-replay"
+    client = {}
+
+    def apply(diff):
+        if diff["type"] == "create":
+            client[diff["event"]["id"]] = diff["event"]
+        elif diff["type"] == "undo" and "event" in diff:
+            client.pop(diff["event"]["id"])
+        elif diff["type"] in {"undo_batch", "replay", "batch"}:
+            for d in diff["diffs"]:
+                apply(d)
+
+    for title in ["a", "b", "c"]:
+        apply(store.apply_command(uid, {"type": "create_event", "title": title}, include_events=False)["diff"])
+    cut = store.history(uid)["items"][-1]["ts"]
+
+    res = store.apply_command(uid, {"op": "replay_to_ts", "ts": cut}, include_events=False)
+    assert res["diff"]["count"] == 2
+    apply(res["diff"])
+    assert sorted(e["title"] for e in client.values()) == ["a"]
+
+    for title in ["d", "e"]:
+        apply(store.apply_command(uid, {"type": "create_event", "title": title}, include_events=False)["diff"])
+    apply(store.apply_batch(uid, [{"op": "replay_to_ts", "ts": cut}, {"type": "create_event", "title": "f"}],
+                            include_events=False)["diff"])
+    assert sorted(client.values(), key=lambda e: e["id"]) == sorted(store.list_events(uid), key=lambda e: e["id"])
+    assert sorted(e["title"] for e in client.values()) == ["a", "f"]
+
+
+def test_apply_batch_is_all_or_nothing():
+    uid = "t-batch"
+    bad = store.apply_batch(uid, [{"type": "create_event", "title": "a"}, {"op": "bogus"}])
+    assert bad["status"] == "error" and bad["index"] == 1
+    assert store.list_events(uid) == []
+    bad = store.apply_batch(uid, [{"type": "create_event", "title": "a"}, {"type": "create_event", "title": 5}])
+    assert bad["status"] == "error" and bad["error"] == "invalid_title" and bad["index"] == 1
+    assert store.list_events(uid) == []
+
+    res = store.apply_batch(uid, [
+        {"type": "create_event", "title": "a"},
+        {"type": "create_event", "title": "b"},
+        {"op": "delete_last"},
+    ])
+    assert [d["type"] for d in res["diff"]["diffs"]] == ["create", "create", "undo"]
+    assert [e["title"] for e in res["events"]] == ["a"]
@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+os.environ.setdefault("CAL_DB_PATH", os.path.join(tempfile.mkdtemp(), "test.db"))
+
+from server.calendarsvc import store, store_sqlite  # noqa: E402
+from server.providers.memory import MemoryProvider  # noqa: E402
+
+
+def test_list_events_time_window():
+    uid = "t-sql-window"
+    for title, start, end in [
+        ("long", "2025-10-01T00:00:00Z", "2025-10-20T00:00:00Z"),
+        ("mon", "2025-10-13T02:00:00-07:00", "2025-10-13T03:00:00-07:00"),
+        ("next", "2025-10-20T09:00:00Z", "2025-10-20T10:00:00Z"),
+        ("before", "2025-10-12T22:00:00Z", "2025-10-13T00:00:00Z"),
+    ]:
+        store_sqlite.apply_command(uid, {"type": "create_event", "title": title, "start": start, "end": end})
+
+    got = store_sqlite.list_events(uid, start="2025-10-13T00:00:00Z", end="2025-10-20T00:00:00Z")
+    assert [e["title"] for e in got] == ["long", "mon"]
+    assert len(store_sqlite.list_events(uid)) == 4
+
+
+def test_window_matches_other_stores():
+    uid = "t-window-agree"
+    provider = MemoryProvider()
+    for title, start, end in [
+        ("naive", "2025-10-13T08:00:00", "2025-10-13T09:00:00"),
+        ("offset", "2025-10-12T20:00:00-07:00", "2025-10-12T21:00:00-07:00"),
+        ("edge", "2025-10-13T00:00:00Z", "2025-10-13T00:00:00Z"),
+        ("ended", "2025-10-12T23:00:00Z", "2025-10-13T00:00:00Z"),
+    ]:
+        cmd = {"type": "create_event", "title": title, "start": start, "end": end}
+        store.apply_command(uid, cmd)
+        store_sqlite.apply_command(uid, cmd)
+        provider.create(uid, {"title": title, "start": start, "end": end})
+
+    window = {"start": "2025-10-13T00:00:00Z", "end": "2025-10-14T00:00:00Z"}
+    expected = ["edge", "offset", "naive"]
+    assert [e["title"] for e in store.list_events(uid, **window)] == expected
+    assert [e["title"] for e in store_sqlite.list_events(uid, **window)] == expected
+    assert [e["title"] for e in provider.list(uid, **window)] == expected
+
+
+def test_hot_queries_use_indexes():
+    hot = [
+        (store_sqlite._SQL_LIST, ("u",)),
+        (store_sqlite._SQL_LAST_ID, ("u",)),
+        (store_sqlite._SQL_WINDOW, ("u", 0, 1, 0, 0)),
+        (store_sqlite._SQL_HISTORY, ("u", 50)),
+    ]
+    cx = store_sqlite._conn()
+    for sql, params in hot:
+        plan = " | ".join(r["detail"] for r in cx.execute("EXPLAIN QUERY PLAN " + sql, params))
+        assert "USING" in plan and "INDEX" in plan, plan
+        assert "SCAN" not in plan and "TEMP B-TREE" not in plan, plan
+
+
+def test_apply_batch_single_transaction():
+    uid = "t-sql-batch"
+    store_sqlite.apply_command(uid, {"type": "create_event", "title": "old"})
+    res = store_sqlite.apply_batch(uid, [
+        {"type": "create_event", "title": "a"},
+        {"type": "create_event", "title": "b"},
+        {"op": "delete_last"},
+        {"op": "delete_last"},
+        {"op": "delete_last"},
+    ])
+    assert res["diff"]["count"] == 5
+    assert res["events"] == []
+    assert res["version"] == store_sqlite.history(uid, limit=1)["items"][0]["id"]
@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+from db.session import init_db
+from services import commands
+from services.events import AsyncEventsService
+
+init_db()
+
+
+def test_command_frames_get_correlated_responses(interpret_cache, monkeypatch):
+    from server.ai import pipeline
+
+    llm_calls = []
+
+    async def fake_llm(text, tz, now_iso):
+        llm_calls.append(text)
+        if text == "gibberish":
+            raise pipeline.InterpretError(422, "Interpreter returned non-JSON")
+        return {"type": "create_event", "title": text, "start": "2025-10-16T12:00:00-07:00",
+                "end": "2025-10-16T12:30:00-07:00"}
+
+    # The socket shares /ai/interpret's pipeline: its LLM stage, cache and fast path
+    monkeypatch.setattr(pipeline, "_llm_interpret", fake_llm)
+    pushed = []
+
+    async def on_change(user_id, message):
+        pushed.append((user_id, message["type"]))
+
+    svc = AsyncEventsService(on_change=on_change)
+
+    async def run():
+        send = lambda frame: commands.handle("t-ws", json.dumps(frame), svc)
+        r = await send({"id": 1, "type": "interpret", "text": "lunch", "tz": "UTC"})
+        assert r == {"type": "response", "id": 1, "ok": True, "command": await pipeline.interpret("lunch", "UTC", "t-ws")}
+        assert r["command"]["type"] == "create_event" and llm_calls == ["lunch"]  # second answer was cached
+        r = await send({"id": 2, "type": "interpret", "text": "delete last", "tz": "UTC"})
+        assert r["command"] == {"op": "delete_last"} and llm_calls == ["lunch"]  # fast path
+        r = await send({"id": 3, "type": "interpret", "text": "gibberish", "tz": "UTC"})
+        assert r == {"type": "response", "id": 3, "ok": False, "error": "interpret failed: Interpreter returned non-JSON"}
+
+        r = await send({"id": "c", "type": "mutate", "op": "create_event", "event": {"title": "Lunch"}})
+        assert r["ok"] and r["id"] == "c" and r["event"]["title"] == "Lunch"
+        r = await send({"id": "d", "type": "mutate", "op": "delete_event", "event_id": r["event"]["id"]})
+        assert r == {"type": "response", "id": "d", "ok": True, "success": True}
+        assert pushed == [("t-ws", "event_created"), ("t-ws", "event_deleted")]
+
+        assert (await send({"id": 5, "type": "mutate", "op": "explode"}))["error"] == "unsupported op: explode"
+        assert (await send({"id": 6, "type": "interpret"}))["error"] == "missing text"
+        assert (await commands.handle("t-ws", "{nope", svc))["error"] == "invalid json"
+
+    asyncio.run(run())
@@ -0,0 +1,244 @@
+"""Broadcast backplanes for ConnectionManager.
+
+A backplane carries an already-encoded room message to every process that may
+hold sockets for that room and hands it to the local fan-out callback there.
+
+- InProcessBackplane: single worker; delivery is a direct call.
+- UnixSocketBackplane: several workers on one host. Every worker binds a Unix
+  datagram socket in a shared directory and publishes by sending one datagram
+  to each peer socket found there. Needs no broker or external service.
+
+A message a peer cannot be given whole is never dropped silently: the
+backplane asks that peer to resync the room (the resync callback closes the
+room's local sockets, and clients reconnect and catch up from the change log).
+"""
+import abc
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str], None]
+Resync = Callable[[str], None]
+
+class Backplane(abc.ABC):
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+        self._resync: Optional[Resync] = None
+
+    async def start(self, deliver: Deliver, resync: Optional[Resync] = None):
+        self._deliver = deliver
+        self._resync = resync
+
+    @abc.abstractmethod
+    async def publish(self, room: str, text: str):
+        """Deliver text to room's sockets in this process and every peer."""
+
+    async def stop(self):
+        self._deliver = None
+        self._resync = None
+
+class InProcessBackplane(Backplane):
+    async def publish(self, room: str, text: str):
+        if self._deliver:
+            self._deliver(room, text)
+
+# Datagram frames, by leading kind byte:
+#   M room NUL text                   a whole message
+#   F id:index:count:room NUL piece   one fragment of a message too big for one datagram
+#   R room                            resync the room: a message for it was lost
+_SEP = b"\x00"
+# Largest datagram payload sent; bigger messages are fragmented. Well under the
+# default AF_UNIX send buffer (~208 KiB), which caps a single datagram.
+_FRAGMENT = 60_000
+# A full peer queue (net.unix.max_dgram_qlen, 10 by default) is retried this
+# long before the message is given up on for that peer
+_SEND_DEADLINE_S = 1.0
+_RETRY_S = 0.002
+# An incomplete fragmented message is discarded (and its room resynced) after this
+_PARTIAL_TTL_S = 5.0
+# Peer directory listing is cached this long between publishes
+_PEERS_TTL_S = 1.0
+
+class _Receiver(asyncio.DatagramProtocol):
+    def __init__(self, on_frame: Callable[[bytes], None]):
+        self.on_frame = on_frame
+
+    def datagram_received(self, data, addr):
+        self.on_frame(data)
+
+class UnixSocketBackplane(Backplane):
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self.node = uuid.uuid4().hex[:8]
+        self.path = os.path.join(directory, f"{os.getpid()}-{self.node}.sock")
+        self.dropped = 0
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._tx: Optional[socket.socket] = None
+        self._peers: List[str] = []
+        self._peers_at = 0.0
+        self._seq = 0
+        # Fragmented messages being reassembled: id -> (room, pieces, first seen)
+        self._partial: Dict[str, Tuple[str, List[Optional[bytes]], float]] = {}
+        # Resyncs a peer still has to be told about, sent before its next frame
+        self._owed: Dict[str, Set[str]] = {}
+        # One sender at a time per peer, so messages (and fragments) stay in order
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def start(self, deliver: Deliver, resync: Optional[Resync] = None):
+        await super().start(deliver, resync)
+        os.makedirs(self.directory, exist_ok=True)
+        rx = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        rx.bind(self.path)
+        rx.setblocking(False)
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: _Receiver(self._on_frame), sock=rx)
+        self._tx = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._tx.setblocking(False)
+
+    def _on_frame(self, data: bytes):
+        self._expire_partials()
+        kind, body = data[:1], data[1:]
+        if kind == b"M":
+            room, _, text = body.partition(_SEP)
+            if self._deliver:
+                self._deliver(room.decode(), text.decode())
+        elif kind == b"F":
+            head, _, piece = body.partition(_SEP)
+            msg_id, index, count, room = head.decode().split(":", 3)
+            _, pieces, _ = self._partial.setdefault(msg_id, (room, [None] * int(count), time.monotonic()))
+            pieces[int(index)] = piece
+            if all(p is not None for p in pieces):
+                del self._partial[msg_id]
+                if self._deliver:
+                    self._deliver(room, b"".join(pieces).decode())
+        elif kind == b"R":
+            self._local_resync(body.decode())
+
+    def _expire_partials(self):
+        now = time.monotonic()
+        for msg_id, (room, _, seen) in list(self._partial.items()):
+            if now - seen > _PARTIAL_TTL_S:
+                # The sender gave up part way through
+                del self._partial[msg_id]
+                log.warning("ws backplane: incomplete message for room %s discarded", room)
+                self._local_resync(room)
+
+    def _local_resync(self, room: str):
+        if self._resync:
+            self._resync(room)
+
+    def _peer_paths(self) -> List[str]:
+        now = time.monotonic()
+        if now - self._peers_at > _PEERS_TTL_S:
+            try:
+                names = os.listdir(self.directory)
+            except FileNotFoundError:
+                names = []
+            self._peers = [os.path.join(self.directory, n) for n in names
+                           if n.endswith(".sock") and os.path.join(self.directory, n) != self.path]
+            self._peers_at = now
+        return self._peers
+
+    def _frames(self, room: str, text: str) -> List[bytes]:
+        payload = text.encode()
+        if len(payload) <= _FRAGMENT:
+            return [b"M" + room.encode() + _SEP + payload]
+        self._seq += 1
+        msg_id = f"{self.node}.{self._seq}"
+        pieces = [payload[i:i + _FRAGMENT] for i in range(0, len(payload), _FRAGMENT)]
+        return [f"F{msg_id}:{i}:{len(pieces)}:{room}".encode() + _SEP + piece for i, piece in enumerate(pieces)]
+
+    async def _send(self, path: str, frame: bytes, deadline: float) -> bool:
+        """Send one datagram, waiting out a full peer queue until the deadline."""
+        while True:
+            try:
+                self._tx.sendto(frame, path)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                await asyncio.sleep(_RETRY_S)
+
+    async def _publish_to(self, path: str, room: str, frames: List[bytes]):
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            await self._publish_locked(path, room, frames)
+
+    async def _publish_locked(self, path: str, room: str, frames: List[bytes]):
+        deadline = time.monotonic() + _SEND_DEADLINE_S
+        try:
+            owed = self._owed.pop(path, set())
+            for owed_room in list(owed):
+                # No waiting here: a peer that is still stuck costs later publishes nothing
+                if not await self._send(path, b"R" + owed_room.encode(), 0.0):
+                    break
+                owed.discard(owed_room)
+            if owed:
+                # Still unreachable: this message can't be delivered in order either
+                owed.add(room)
+                self._owed[path] = owed
+                self.dropped += 1
+                return
+            for frame in frames:
+                if not await self._send(path, frame, deadline):
+                    self._lost(path, room, "peer queue full")
+                    return
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Worker exited without cleaning up: forget its socket
+            self._forget(path)
+        except OSError as e:
+            self._lost(path, room, str(e))
+
+    def _lost(self, path: str, room: str, why: str):
+        self.dropped += 1
+        log.warning("ws backplane: message for room %s not delivered to %s (%s); asking it to resync",
+                    room, os.path.basename(path), why)
+        try:
+            self._tx.sendto(b"R" + room.encode(), path)
+        except OSError:
+            self._owed.setdefault(path, set()).add(room)
+
+    def _forget(self, path: str):
+        if path in self._peers:
+            self._peers.remove(path)
+        self._owed.pop(path, None)
+        self._locks.pop(path, None)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    async def publish(self, room: str, text: str):
+        if self._deliver:
+            self._deliver(room, text)
+        if not self._tx:
+            return
+        frames = self._frames(room, text)
+        await asyncio.gather(*(self._publish_to(path, room, frames) for path in list(self._peer_paths())))
+
+    async def stop(self):
+        await super().stop()
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        if self._tx:
+            self._tx.close()
+            self._tx = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+def make_backplane(kind: str, directory: str) -> Backplane:
+    if kind == "inprocess":
+        return InProcessBackplane()
+    if kind == "unix":
+        return UnixSocketBackplane(directory)
+    raise ValueError(f"unknown ws backplane: {kind}")
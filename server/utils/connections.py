@@ -1,28 +1,202 @@
-from typing import Dict, Set
+import asyncio
+import json
+from typing import Dict, List, Optional
 from fastapi import WebSocket
+from core.config import settings
+from utils.backplane import Backplane, InProcessBackplane, make_backplane
+
+# Slow-consumer policies: what happens when a socket's send queue is full
+DROP = "drop"              # discard the new message for that socket only
+DISCONNECT = "disconnect"  # close the socket; the client reconnects and resyncs
+
+# A coalesced frame is flushed early once it holds this many messages
+_COALESCE_MAX = 500
+
+def encode(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+def _newer_than(text: str, version: int) -> Optional[str]:
+    """The encoded room message minus any change at or below version (None if nothing is left)."""
+    message = json.loads(text)
+    if message.get("type") == "batch":
+        kept = [m for m in message["messages"] if m.get("version", version + 1) > version]
+        if len(kept) == len(message["messages"]):
+            return text
+        if not kept:
+            return None
+        return encode(kept[0] if len(kept) == 1 else {"type": "batch", "messages": kept})
+    return text if message.get("version", version + 1) > version else None
+
+class _Peer:
+    """One socket plus its bounded outbound queue, drained by a sender task.
+
+    A paused peer (still syncing) holds room broadcasts in `held` instead.
+    """
+    __slots__ = ("ws", "queue", "task", "dropped", "held")
+
+    def __init__(self, ws: WebSocket, maxsize: int, paused: bool = False):
+        self.ws = ws
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.held: Optional[List[str]] = [] if paused else None
 
 class ConnectionManager:
-    def __init__(self):
-        self.rooms: Dict[str, Set[WebSocket]] = {}
+    def __init__(self, queue_size: int = 256, slow_policy: str = DISCONNECT, backplane: Optional[Backplane] = None,
+                 coalesce_ms: int = 0):
+        if slow_policy not in (DROP, DISCONNECT):
+            raise ValueError(f"unknown slow consumer policy: {slow_policy}")
+        self.rooms: Dict[str, Dict[WebSocket, _Peer]] = {}
+        self.queue_size = queue_size
+        self.slow_policy = slow_policy
+        self.backplane = backplane or InProcessBackplane()
+        self._started = False
+        # Coalescing window: broadcasts to a room within it go out as one
+        # {"type": "batch", "messages": [...]} frame (0 disables)
+        self.coalesce_s = coalesce_ms / 1000.0
+        self._pending: Dict[str, List[dict]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    async def start(self):
+        if not self._started:
+            await self.backplane.start(self._fanout, self._resync_room)
+            self._started = True
+
+    async def stop(self):
+        for room in list(self._pending):
+            await self._flush(room)
+        if self._started:
+            await self.backplane.stop()
+            self._started = False
 
-    async def connect(self, room: str, ws: WebSocket):
+    async def connect(self, room: str, ws: WebSocket, paused: bool = False):
+        """Join the room. A paused socket holds broadcasts until resume()."""
         await ws.accept()
-        self.rooms.setdefault(room, set()).add(ws)
+        peer = _Peer(ws, self.queue_size, paused)
+        peer.task = asyncio.create_task(self._pump(room, peer))
+        self.rooms.setdefault(room, {})[ws] = peer
+
+    def resume(self, room: str, ws: WebSocket, sync: dict):
+        """Queue a paused socket's versioned sync message, then the broadcasts
+        held since connect() that are newer than it.
+
+        Joining before reading the sync state means no commit can fall in
+        between; holding broadcasts until now means none overtakes the sync
+        message, which would make a client with a version cursor skip one of them.
+        """
+        peer = self.rooms.get(room, {}).get(ws)
+        if peer is None or peer.held is None:
+            return
+        held, peer.held = peer.held, None
+        self._offer(room, peer, encode(sync))
+        for text in held:
+            newer = _newer_than(text, sync["version"])
+            if newer is not None:
+                self._offer(room, peer, newer)
 
     def disconnect(self, room: str, ws: WebSocket):
+        peers = self.rooms.get(room)
+        if not peers:
+            return
+        peer = peers.pop(ws, None)
+        if not peers:
+            del self.rooms[room]
+        if peer and peer.task and peer.task is not asyncio.current_task():
+            peer.task.cancel()
+
+    async def _pump(self, room: str, peer: _Peer):
         try:
-            if room in self.rooms and ws in self.rooms[room]:
-                self.rooms[room].remove(ws)
-                if not self.rooms[room]:
-                    del self.rooms[room]
+            while True:
+                text = await peer.queue.get()
+                await peer.ws.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.disconnect(room, peer.ws)
+
+    def _offer(self, room: str, peer: _Peer, text: str):
+        if peer.held is not None:
+            if len(peer.held) < self.queue_size:
+                peer.held.append(text)
+                return
+        else:
+            try:
+                peer.queue.put_nowait(text)
+                return
+            except asyncio.QueueFull:
+                pass
+        if self.slow_policy == DROP:
+            peer.dropped += 1
+            return
+        self.disconnect(room, peer.ws)
+        asyncio.ensure_future(self._close(peer.ws, 1013))
+
+    def _resync_room(self, room: str):
+        # A broadcast for this room was lost on its way to this worker: close the
+        # room's sockets so their clients reconnect and catch up from the change log
+        for peer in list(self.rooms.get(room, {}).values()):
+            self.disconnect(room, peer.ws)
+            asyncio.ensure_future(self._close(peer.ws, 1013))
+
+    @staticmethod
+    async def _close(ws: WebSocket, code: int):
+        try:
+            await ws.close(code=code)
         except Exception:
             pass
 
+    async def send(self, room: str, ws: WebSocket, message: dict):
+        """Queue a message for one socket, after every broadcast already fanned out.
+
+        Broadcasts still waiting in a coalescing window are not flushed first,
+        so with coalesce_ms set they may reach the socket after this message.
+        """
+        peer = self.rooms.get(room, {}).get(ws)
+        if peer:
+            self._offer(room, peer, encode(message))
+
     async def broadcast_room(self, room: str, message: dict):
-        for ws in list(self.rooms.get(room, set())):
-            try:
-                await ws.send_json(message)
-            except Exception:
-                self.disconnect(room, ws)
+        # Encode once; the backplane hands the text to every worker's _fanout
+        if not self._started:
+            await self.start()
+        if self.coalesce_s <= 0:
+            await self.backplane.publish(room, encode(message))
+            return
+        pending = self._pending.get(room)
+        if pending is None:
+            self._pending[room] = [message]
+            self._timers[room] = asyncio.get_running_loop().call_later(self.coalesce_s, self._flush_later, room)
+            return
+        pending.append(message)
+        if len(pending) >= _COALESCE_MAX:
+            await self._flush(room)
+
+    def _flush_later(self, room: str):
+        asyncio.ensure_future(self._flush(room))
+
+    async def _flush(self, room: str):
+        # An early flush (full window, stop) must not leave the timer to cut the next window short
+        timer = self._timers.pop(room, None)
+        if timer:
+            timer.cancel()
+        messages = self._pending.pop(room, None)
+        if not messages:
+            return
+        message = messages[0] if len(messages) == 1 else {"type": "batch", "messages": messages}
+        await self.backplane.publish(room, encode(message))
+
+    def _fanout(self, room: str, text: str):
+        # Enqueue everywhere; sender tasks deliver concurrently so a slow socket
+        # only ever backs up its own queue.
+        peers = self.rooms.get(room)
+        if not peers:
+            return
+        for peer in list(peers.values()):
+            self._offer(room, peer, text)
 
-manager = ConnectionManager()
+manager = ConnectionManager(
+    settings.ws_send_queue,
+    settings.ws_slow_consumer,
+    make_backplane(settings.ws_backplane, settings.ws_backplane_dir),
+    settings.ws_coalesce_ms,
+)